@@ -1,10 +1,15 @@
+import sys
+from pathlib import Path
 import streamlit as st
-import pandas as pd
-import requests
 import datetime as dt
-import matplotlib.pyplot as plt
-import seaborn as sns
-import eurostat
+
+# Shared adapters and UI helpers live one level up, in Data_Collection/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from charts import chart_download, chart_zip_download, line_chart
+from datasources import get_source
+from datasources.eurostat.metadata_index import FIXED_DIMENSIONS
+from datasources.eurostat.reshape import fractional_year
+from explorer_ui import data_download, metric_cards, run_fetch, styled_table
 
 # Page config with EU-themed colors
 st.set_page_config(
@@ -189,6 +194,25 @@ with st.sidebar:
         index=0
     )
     
+    # Optional dimension filters, filled from the local metadata index
+    dataset_code = DATASETS[selected_domain][selected_dataset]
+    dimension_filters = {}
+    dataset_dimensions = get_source("eurostat").metadata(dataset_code, wait=False)
+    if dataset_dimensions is None:
+        st.caption("Loading dataset dimensions...")
+    else:
+        for dim, codes in dataset_dimensions.items():
+            if dim in FIXED_DIMENSIONS or len(codes) < 2:
+                continue
+            chosen = st.multiselect(
+                f"Filter: {dim}",
+                list(codes.keys()),
+                format_func=lambda code, codes=codes: f"{codes[code]} ({code})",
+                key=f"{dataset_code}_{dim}"
+            )
+            if chosen:
+                dimension_filters[dim] = chosen
+    
     # Region selection
     region = st.selectbox(
         "3. Select Region", 
@@ -231,72 +255,40 @@ with st.sidebar:
 # DATA FETCHING FUNCTION (Eurostat version - FIXED)
 # ==============================================
 
-@st.cache_data(ttl=24*3600)
-def fetch_eurostat_data(dataset_code, country_code, start_year, end_year):
-    """Fetches data from Eurostat API with proper handling of geo\time column"""
-    try:
-        # Get the dataset
-        df = eurostat.get_data_df(dataset_code, flags=False)
-        
-        if df is None or df.empty:
-            st.warning("No data available for the selected parameters")
-            return None
-            
-        # Properly handle the geo\time column (with backslash)
-        geo_time_col = [col for col in df.columns if 'geo' in col.lower() and 'time' in col.lower()]
-        
-        if not geo_time_col:
-            st.warning("Could not find geo\\time column in the dataset")
-            return None
-            
-        geo_time_col = geo_time_col[0]  # Get the actual column name
-        
-        # Filter for the selected country
-        country_filter = df[geo_time_col] == country_code
-        df = df[country_filter]
-        
-        if df.empty:
-            st.warning(f"No data available for {country_code}")
-            return None
-            
-        # Reshape the data from wide to long format
-        id_vars = [geo_time_col]
-        value_vars = [col for col in df.columns if col not in id_vars]
-        
-        df = df.melt(id_vars=id_vars, value_vars=value_vars, var_name='period', value_name='value')
-        
-        # Extract year from period (format may be 2020, 2020Q1, 2020M01, etc.)
-        df['year'] = df['period'].str.extract(r'(\d{4})').astype(int)
-        
-        # Filter by year range
-        df = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
-        
-        if df.empty:
-            st.warning("No data available for the selected year range")
-            return None
-            
-        # Clean up the dataframe
-        df = df.rename(columns={
-            geo_time_col: 'country',
-            'value': 'Value',
-            'year': 'Year'
-        })
-        
-        # Add metadata
-        df['Country'] = selected_country
-        df['Dataset'] = selected_dataset
-        
-        # Get units from Eurostat metadata
-        metadata = eurostat.get_pars(dataset_code)
-        unit = metadata.get('unit', {}).get('label', '')
-        df['Unit'] = unit
-        
-        return df[['Year', 'period', 'Country', 'Dataset', 'Value', 'Unit']].sort_values('Year')
-    
-    except Exception as e:
-        st.error(f"Error fetching Eurostat data: {str(e)}")
+def fetch_eurostat_data(dataset_code, country_code, start_year, end_year, dimension_filters=None):
+    """Fetches data from Eurostat through the shared adapter (cached per query)"""
+    df = run_fetch(
+        get_source("eurostat"),
+        "Eurostat",
+        dataset_code=dataset_code,
+        country_code=country_code,
+        start_year=start_year,
+        end_year=end_year,
+        dimension_filters=dimension_filters
+    )
+    if df is None:
         return None
 
+    # Add metadata
+    df['Country'] = selected_country
+    df['Dataset'] = selected_dataset
+    return df[['Year', 'period', 'Country', 'Dataset', 'Value', 'Unit']]
+
+def eurostat_chart(data, dataset, country):
+    """(frame, x, y, spec) for a dataset's trend chart"""
+    # Quarterly and monthly periods sit between the years on the time axis
+    return (
+        data.assign(Time=fractional_year(data["period"])),
+        "Time",
+        "Value",
+        {
+            "title": f"{dataset} Trend ({country})",
+            "xlabel": "Year",
+            "ylabel": f"{dataset} ({data.iloc[0]['Unit']})",
+            "color": "#003399",
+        }
+    )
+
 # ==============================================
 # MAIN DISPLAY (Adjusted for Eurostat)
 # ==============================================
@@ -315,14 +307,19 @@ with col1:
                 dataset_code,
                 country_code,
                 year_range[0],
-                year_range[1]
+                year_range[1],
+                dimension_filters
             )
             
             if df is not None:
                 st.session_state.eurostat_data = df
                 st.session_state.current_query = {
                     "dataset": selected_dataset,
-                    "country": selected_country
+                    "dataset_code": dataset_code,
+                    "country": selected_country,
+                    "start_year": year_range[0],
+                    "end_year": year_range[1],
+                    "filters": dimension_filters
                 }
                 st.success("Data loaded successfully!")
 
@@ -335,43 +332,15 @@ if 'eurostat_data' in st.session_state:
     st.markdown("---")
     st.markdown("<h3 style='color: #003399;'>Key Metrics</h3>", unsafe_allow_html=True)
     
-    # Filter out NA values for calculations
-    clean_df = df.dropna(subset=['Value'])
+    metric_cards(df)
     
-    if not clean_df.empty:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(
-                "First Year Value", 
-                f"{clean_df.iloc[0]['Value']:,.2f} {clean_df.iloc[0]['Unit']}",
-                help=f"Value in {clean_df.iloc[0]['Year']}"
-            )
-        with col2:
-            st.metric(
-                "Last Year Value", 
-                f"{clean_df.iloc[-1]['Value']:,.2f} {clean_df.iloc[-1]['Unit']}",
-                help=f"Value in {clean_df.iloc[-1]['Year']}"
-            )
-        with col3:
-            change = ((clean_df.iloc[-1]['Value'] - clean_df.iloc[0]['Value']) / clean_df.iloc[0]['Value']) * 100
-            st.metric(
-                "Change Over Period", 
-                f"{change:.1f}%",
-                delta_color="inverse" if change < 0 else "normal",
-                help=f"Percentage change from {clean_df.iloc[0]['Year']} to {clean_df.iloc[-1]['Year']}"
-            )
-    else:
-        st.warning("No valid data points available for metrics calculation")
+    # Filter out NA values for the table, charts and export
+    clean_df = df.dropna(subset=['Value'])
     
     # Main dataframe
     st.markdown("---")
     st.markdown(f"<h3 style='color: #003399;'>{query['dataset']} in {query['country']}</h3>", unsafe_allow_html=True)
-    st.dataframe(
-        clean_df.style.applymap(lambda x: 'color: #B0B0B0' if isinstance(x, str) else 'color: white'),
-        hide_index=True,
-        use_container_width=True,
-        height=min(400, 35 * (len(clean_df) + 1))
-    )
+    styled_table(clean_df, key="eurostat_table")
     
     # Visualization tabs with dark theme charts
     st.markdown("---")
@@ -379,42 +348,7 @@ if 'eurostat_data' in st.session_state:
     
     with tab1:
         if not clean_df.empty:
-            # Set dark background for matplotlib
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 5))
-            
-            # Create plot with EU colors
-            sns.lineplot(
-                data=clean_df, 
-                x="Year", 
-                y="Value", 
-                marker="o",
-                color="#003399",
-                linewidth=2.5,
-                markersize=8
-            )
-            
-            # Customize plot appearance
-            ax.set_facecolor('#1E1E1E')
-            ax.grid(color='#2E2E2E', linestyle='--', linewidth=0.5)
-            ax.set_title(
-                f"{query['dataset']} Trend ({query['country']})",
-                color='white',
-                pad=20,
-                fontsize=14
-            )
-            ax.set_xlabel("Year", color='#B0B0B0')
-            ax.set_ylabel(
-                f"{query['dataset']} ({clean_df.iloc[0]['Unit']})", 
-                color='#B0B0B0'
-            )
-            
-            # Rotate x-axis labels for better readability
-            plt.xticks(rotation=45)
-            
-            # Adjust layout to prevent label cutoff
-            plt.tight_layout()
-            st.pyplot(fig)
+            line_chart(*eurostat_chart(clean_df, query['dataset'], query['country']))
         else:
             st.warning("No valid data points available for visualization")
     
@@ -446,23 +380,51 @@ if 'eurostat_data' in st.session_state:
     st.markdown("<h3 style='color: #003399;'>Export Data</h3>", unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
-        csv = clean_df.to_csv(index=False)
-        st.download_button(
-            "💾 Download CSV",
-            csv,
-            file_name=f"Eurostat_{query['dataset'].replace(' ', '_')}_{query['country']}.csv",
-            mime="text/csv",
+        data_download(
+            clean_df,
+            f"Eurostat_{query['dataset'].replace(' ', '_')}_{query['country']}",
+            key="eurostat_export",
             use_container_width=True
         )
     with col2:
-        # In a real implementation, this would export the chart
-        st.download_button(
-            "📊 Download Chart as PNG",
-            b"",  # Placeholder for actual implementation
-            file_name="Eurostat_chart.png",
-            disabled=True,
-            use_container_width=True,
-            help="Coming soon - will export the visualization as PNG"
+        if not clean_df.empty:
+            chart_download(
+                *eurostat_chart(clean_df, query['dataset'], query['country']),
+                f"Eurostat_{query['dataset'].replace(' ', '_')}_{query['country']}",
+                key="eurostat_chart",
+                use_container_width=True
+            )
+    
+    # One chart per selected country for the same dataset, years and filters
+    with st.expander("🖼️ Batch Chart Export"):
+        all_countries = {name: code for group in COUNTRIES.values() for name, code in group.items()}
+        batch_countries = st.multiselect("Countries", list(all_countries), key="eurostat_batch_countries")
+        
+        def build_batch_charts():
+            charts = []
+            for name in batch_countries:
+                try:
+                    data = get_source("eurostat").fetch(
+                        dataset_code=query['dataset_code'],
+                        country_code=all_countries[name],
+                        start_year=query['start_year'],
+                        end_year=query['end_year'],
+                        dimension_filters=query['filters']
+                    ).dropna(subset=['Value'])
+                except Exception as e:
+                    st.warning(f"{name}: {e}")
+                    continue
+                if data.empty:
+                    continue
+                chart = eurostat_chart(data, query['dataset'], name)
+                charts.append((f"Eurostat_{query['dataset_code']}_{all_countries[name]}", *chart))
+            return charts
+        
+        chart_zip_download(
+            build_batch_charts,
+            len(batch_countries),
+            f"Eurostat_{query['dataset_code']}_charts",
+            key="eurostat_batch"
         )
 
 # ==============================================
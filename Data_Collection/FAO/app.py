@@ -1,10 +1,13 @@
+import sys
+from pathlib import Path
 import streamlit as st
-import pandas as pd
-import requests
-from io import StringIO
 import datetime as dt
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# Shared adapters and UI helpers live one level up, in Data_Collection/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from charts import chart_download, chart_zip_download, line_chart
+from datasources import get_source
+from explorer_ui import data_download, metric_cards, run_fetch, styled_table
 
 # Page config with dark theme
 st.set_page_config(
@@ -220,59 +223,35 @@ with st.sidebar:
 # DATA FETCHING FUNCTION (Same as before)
 # ==============================================
 
-@st.cache_data(ttl=24*3600)
 def fetch_faostat_data(domain, metric, item_code, country_code, start_year, end_year):
     """Simulates FAOSTAT API call with realistic parameters"""
-    try:
-        # Generate realistic sample data
-        years = list(range(start_year, end_year + 1))
-        base_value = {
-            "Production": 1000000,
-            "Yield": 30,
-            "Area Harvested": 50000,
-            "Import Quantity": 500000,
-            "Export Quantity": 300000,
-            "Value": 250000000,
-            "Food Supply": 2500,
-            "Dietary Energy Supply": 3000,
-            "Producer Price": 150,
-            "Consumer Price": 200,
-            "Emissions": 50000,
-            "Carbon Stock": 1000000
-        }.get(metric, 1000)
-        
-        # Create realistic trends
-        data = {
-            "Year": years,
-            "Value": [int(base_value * (1 + 0.02*(year - start_year)) * (0.95 + 0.1*(item_code%10)/10)) 
-                     for year in years],
-            "Unit": {
-                "Production": "tonnes",
-                "Yield": "hg/ha",
-                "Area Harvested": "ha",
-                "Import Quantity": "tonnes",
-                "Export Quantity": "tonnes",
-                "Value": "1000 US$",
-                "Food Supply": "kcal/capita/day",
-                "Dietary Energy Supply": "kcal/capita/day",
-                "Producer Price": "US$/tonne",
-                "Consumer Price": "US$/tonne",
-                "Emissions": "kt CO2eq",
-                "Carbon Stock": "kt C"
-            }.get(metric, "units"),
-            "Flag": ["Official" if year%2==0 else "Estimated" for year in years],
-            "Country": selected_country,
-            "Item": selected_commodity,
-            "Domain": selected_domain,
-            "Metric": metric
+    # Generate realistic sample data with the vectorized cube generator
+    df = run_fetch(
+        get_source("faostat_simulated"),
+        "FAOSTAT",
+        metrics=[metric],
+        items={selected_commodity: item_code},
+        countries={selected_country: country_code},
+        start_year=start_year,
+        end_year=end_year
+    )
+    if df is not None:
+        df["Domain"] = selected_domain
+    return df
+
+def faostat_chart(data, metric, country):
+    """(frame, x, y, spec) for a metric's trend chart"""
+    return (
+        data,
+        "Year",
+        "Value",
+        {
+            "title": f"{metric} Trend ({country})",
+            "xlabel": "Year",
+            "ylabel": f"{metric} ({data.iloc[0]['Unit']})",
+            "color": "#4CAF50",
         }
-        
-        df = pd.DataFrame(data)
-        return df
-    
-    except Exception as e:
-        st.error(f"Error generating data: {str(e)}")
-        return None
+    )
 
 # ==============================================
 # MAIN DISPLAY (Improved Visual Hierarchy)
@@ -303,7 +282,10 @@ with col1:
                 st.session_state.current_query = {
                     "metric": selected_metric,
                     "commodity": selected_commodity,
-                    "country": selected_country
+                    "item_code": item_code,
+                    "country": selected_country,
+                    "start_year": year_range[0],
+                    "end_year": year_range[1]
                 }
                 st.success("Data loaded successfully!")
 
@@ -315,79 +297,19 @@ if 'faostat_data' in st.session_state:
     # Metrics cards with improved styling
     st.markdown("---")
     st.markdown("<h3 style='color: #4CAF50;'>Key Metrics</h3>", unsafe_allow_html=True)
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric(
-            "First Year Value", 
-            f"{df.iloc[0]['Value']:,} {df.iloc[0]['Unit']}",
-            help=f"Value in {year_range[0]}"
-        )
-    with col2:
-        st.metric(
-            "Last Year Value", 
-            f"{df.iloc[-1]['Value']:,} {df.iloc[-1]['Unit']}",
-            help=f"Value in {year_range[1]}"
-        )
-    with col3:
-        change = ((df.iloc[-1]['Value'] - df.iloc[0]['Value']) / df.iloc[0]['Value']) * 100
-        st.metric(
-            "Change Over Period", 
-            f"{change:.1f}%",
-            delta_color="inverse" if change < 0 else "normal",
-            help=f"Percentage change from {year_range[0]} to {year_range[1]}"
-        )
+    metric_cards(df, value_format="{:,}")
     
     # Main dataframe with better contrast
     st.markdown("---")
     st.markdown(f"<h3 style='color: #4CAF50;'>{query['metric']} of {query['commodity']} in {query['country']}</h3>", unsafe_allow_html=True)
-    st.dataframe(
-        df.style.applymap(lambda x: 'color: #B0B0B0' if isinstance(x, str) else 'color: white'),
-        hide_index=True,
-        use_container_width=True,
-        height=min(400, 35 * (len(df) + 1))
-    )
+    styled_table(df, key="faostat_table")
     
     # Visualization tabs with dark theme charts
     st.markdown("---")
     tab1, tab2 = st.tabs(["📈 Time Series Analysis", "📊 Statistical Insights"])
     
     with tab1:
-        # Set dark background for matplotlib
-        plt.style.use('dark_background')
-        fig, ax = plt.subplots(figsize=(10, 5))
-        
-        # Create plot with better contrast
-        sns.lineplot(
-            data=df, 
-            x="Year", 
-            y="Value", 
-            marker="o",
-            color="#4CAF50",
-            linewidth=2.5,
-            markersize=8
-        )
-        
-        # Customize plot appearance
-        ax.set_facecolor('#1E1E1E')
-        ax.grid(color='#2E2E2E', linestyle='--', linewidth=0.5)
-        ax.set_title(
-            f"{query['metric']} Trend ({query['country']})",
-            color='white',
-            pad=20,
-            fontsize=14
-        )
-        ax.set_xlabel("Year", color='#B0B0B0')
-        ax.set_ylabel(
-            f"{query['metric']} ({df.iloc[0]['Unit']})", 
-            color='#B0B0B0'
-        )
-        
-        # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
-        
-        # Adjust layout to prevent label cutoff
-        plt.tight_layout()
-        st.pyplot(fig)
+        line_chart(*faostat_chart(df, query['metric'], query['country']))
     
     with tab2:
         col1, col2 = st.columns(2)
@@ -414,23 +336,48 @@ if 'faostat_data' in st.session_state:
     st.markdown("<h3 style='color: #4CAF50;'>Export Data</h3>", unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
-        csv = df.to_csv(index=False)
-        st.download_button(
-            "💾 Download CSV",
-            csv,
-            file_name=f"FAOSTAT_{query['commodity']}_{query['country']}.csv",
-            mime="text/csv",
+        data_download(
+            df,
+            f"FAOSTAT_{query['commodity']}_{query['country']}",
+            key="faostat_export",
             use_container_width=True
         )
     with col2:
-        # In a real implementation, this would export the chart
-        st.download_button(
-            "📊 Download Chart as PNG",
-            b"",  # Placeholder for actual implementation
-            file_name="FAOSTAT_chart.png",
-            disabled=True,
-            use_container_width=True,
-            help="Coming soon - will export the visualization as PNG"
+        chart_download(
+            *faostat_chart(df, query['metric'], query['country']),
+            f"FAOSTAT_{query['commodity']}_{query['country']}",
+            key="faostat_chart",
+            use_container_width=True
+        )
+    
+    # One chart per selected country for the same metric, commodity and years
+    with st.expander("🖼️ Batch Chart Export"):
+        all_countries = {name: code for group in COUNTRIES.values() for name, code in group.items()}
+        batch_countries = st.multiselect("Countries", list(all_countries), key="faostat_batch_countries")
+        
+        def build_batch_charts():
+            # The generator returns every selected country in one frame
+            data = run_fetch(
+                get_source("faostat_simulated"),
+                "FAOSTAT",
+                metrics=[query['metric']],
+                items={query['commodity']: query['item_code']},
+                countries={name: all_countries[name] for name in batch_countries},
+                start_year=query['start_year'],
+                end_year=query['end_year']
+            )
+            if data is None:
+                return []
+            return [
+                (f"FAOSTAT_{query['commodity']}_{name}", *faostat_chart(group, query['metric'], name))
+                for name, group in data.groupby('Country', sort=False)
+            ]
+        
+        chart_zip_download(
+            build_batch_charts,
+            len(batch_countries),
+            f"FAOSTAT_{query['commodity']}_charts",
+            key="faostat_batch"
         )
 
 # ==============================================
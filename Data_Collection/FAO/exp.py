@@ -1,10 +1,13 @@
+import sys
+from pathlib import Path
 import streamlit as st
 import pandas as pd
 import datetime as dt
-import requests
-from io import StringIO
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+# Shared adapters and UI helpers live one level up, in Data_Collection/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from datasources import get_source
+from explorer_ui import data_download, run_fetch
 
 st.title("FAOSTAT Agricultural Data Explorer")
 st.markdown("")
@@ -82,50 +85,27 @@ with col2:
 
 st.markdown("")
 
-# Create a custom session with retries
-def create_session():
-    session = requests.Session()
-    retry = Retry(
-        total=5,
-        backoff_factor=0.5,
-        status_forcelist=[500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
-    return session
-
 def fetch_faostat_data(domain, item_code, country_code, start_year, end_year):
-    try:
-        # FAOSTAT API endpoint for bulk download
-        base_url = "https://www.fao.org/fishery/static/Data/GlobalProduction/FAOSTAT_data/"
-        
-        # For demonstration, we'll use a simplified approach since FAOSTAT API requires authentication
-        # In a real implementation, you would use the FAOSTAT API with proper authentication
-        
-        # This is a placeholder - actual implementation would use the FAOSTAT API
-        st.warning("Note: This is a demonstration. A real implementation would use the FAOSTAT API with proper authentication.")
-        
-        # For demo purposes, we'll create sample data
-        years = list(range(start_year, end_year + 1))
-        data = {
-            'Year': years,
-            'Value': [1000 + i * 50 + (int(item_code) % 100) for i in range(len(years))],
-            'Unit': ['tonnes'] * len(years),
-            'Item': [selected_item] * len(years),
-            'Country': [selected_country] * len(years),
-            'Domain': [selected_domain] * len(years)
-        }
-        
-        df = pd.DataFrame(data)
-        return df
-        
-    except Exception as e:
-        st.error(f"Error fetching FAOSTAT data: {str(e)}")
+    # Ingest only the commodities and countries offered above; later queries read Parquet only
+    df = run_fetch(
+        get_source("faostat"),
+        "FAOSTAT",
+        domain_code=domain,
+        item_code=item_code,
+        area_code=country_code,
+        start_year=start_year,
+        end_year=end_year,
+        ingest_item_codes=tuple(popular_items.values()),
+        ingest_area_codes=tuple(country_codes.values())
+    )
+    if df is None:
         return None
+    
+    df['Item'] = selected_item
+    df['Country'] = selected_country
+    df['Domain'] = selected_domain
+    
+    return df[['Year', 'Element', 'Value', 'Unit', 'Item', 'Country', 'Domain']]
 
 # Session state management
 if 'faostat_data' not in st.session_state:
@@ -189,6 +169,7 @@ if st.session_state.faostat_data is not None:
     st.write("### Column Descriptions")
     descriptions = {
         'Year': 'Year of the data record',
+        'Element': 'The measured element (production, area harvested, yield, ...)',
         'Value': 'The quantitative value for the selected item',
         'Unit': 'Measurement unit (tonnes, hectares, etc.)',
         'Item': 'The agricultural commodity or item',
@@ -198,16 +179,15 @@ if st.session_state.faostat_data is not None:
     st.table(pd.DataFrame(descriptions.items(), columns=['Column', 'Description']))
     
     # Export CSV
-    csv = st.session_state.faostat_data.to_csv(index=False)
-    st.download_button(
-        "Download CSV",
-        csv,
-        file_name=f"FAOSTAT_{query['item']}_{query['country']}_{start_year}_{end_year}.csv",
-        mime="text/csv"
+    data_download(
+        st.session_state.faostat_data,
+        f"FAOSTAT_{query['item']}_{query['country']}_{start_year}_{end_year}",
+        key="faostat_export",
+        label="Download"
     )
 
     # Simple visualization
-    st.line_chart(st.session_state.faostat_data.set_index('Year')['Value'])
+    st.line_chart(st.session_state.faostat_data.pivot_table(index='Year', columns='Element', values='Value'))
 
 # Sidebar with additional information
 st.sidebar.markdown(
@@ -1,15 +1,15 @@
+import sys
+from pathlib import Path
 import streamlit as st
-import yfinance as yf
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import json
-from datetime import date, timedelta
 import pandas as pd
 import datetime as dt 
-import time
-from requests.exceptions import RequestException
-import backoff  
+
+# Shared adapters and UI helpers live one level up, in Data_Collection/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from datasources import get_source
+from datasources.stocks.adapter import INTERVALS
+from datasources.stocks.intraday import INTRADAY_LIMITS
+from explorer_ui import data_download, run_fetch
 
 st.title("Stock Market Data Fetch")
 st.markdown("")
@@ -40,7 +40,22 @@ top_200_tickers = [
 ]
 
 # Simplified ticker selection without search
-selected_ticker = st.selectbox("Select Ticker Symbol", top_200_tickers)
+batch_mode = st.checkbox("Batch mode (fetch several tickers at once)")
+if batch_mode:
+    select_all = st.checkbox("Select all tickers")
+    selected_tickers = st.multiselect(
+        "Select Ticker Symbols",
+        list(dict.fromkeys(top_200_tickers)),
+        default=list(dict.fromkeys(top_200_tickers)) if select_all else None
+    )
+    selected_ticker = f"{len(selected_tickers)} tickers"
+else:
+    selected_ticker = st.selectbox("Select Ticker Symbol", top_200_tickers)
+
+# Daily bars go back decades; Yahoo keeps intraday bars for a limited time only
+interval = st.selectbox("Bar Interval", INTERVALS)
+if interval != "1d":
+    st.caption(f"Yahoo Finance serves {interval} bars for the last {INTRADAY_LIMITS[interval][1]} days; earlier dates are skipped. Timestamps are in UTC.")
 
 st.markdown("")
 
@@ -61,77 +76,18 @@ except ValueError:
 
 st.markdown("")
 
-# Create a custom session with retries
-def create_session():
-    session = requests.Session()
-    retry = Retry(
-        total=5,
-        backoff_factor=0.5,
-        status_forcelist=[500, 502, 503, 504],
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
-    return session
-
-def fetch_stock_data(ticker, start_date, end_date):
-    try:
-        session = create_session()
-        ticker_obj = yf.Ticker(ticker, session=session)
-        
-        # Fetch data with adjusted close
-        data = ticker_obj.history(
-            start=start_date,
-            end=end_date,
-            interval="1d",
-            auto_adjust=False,  # Set to False to get both adjusted and unadjusted prices
-            actions=True
-        )
-        
-        if data is None or data.empty:
-            st.warning(f"No data available for {ticker} in the specified date range.")
-            return None
-            
-        # Rename columns to match requirements
-        data = data.rename(columns={
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Adj Close': 'adj_close',
-            'Volume': 'volume'
-        })
-        
-        # Ensure all required columns are present
-        required_columns = ['open', 'high', 'low', 'close', 'adj_close', 'volume']
-        if not all(col in data.columns for col in required_columns):
-            st.warning("Retrieved data is missing required columns.")
-            return None
-        
-        # Reset index to make date a column and rename it
-        data = data.reset_index()
-        data = data.rename(columns={'Date': 'date'})
-        
-        # Select and reorder columns
-        data = data[['date', 'open', 'high', 'low', 'close', 'adj_close', 'volume']]
-        
-        return data
-        
-    except Exception as e:
-        st.error(f"Error fetching data: {str(e)}")
-        return None
-    finally:
-        if session:
-            session.close()
+def fetch_stock_data(ticker, start_date, end_date, interval="1d"):
+    # Serve from the local store and only download missing date ranges
+    return run_fetch(get_source("stocks"), "stock", ticker=ticker, start_date=start_date, end_date=end_date,
+                     interval=interval)
 
 # Add this after initial imports
 if 'data' not in st.session_state:
     st.session_state.data = None
 if 'last_ticker' not in st.session_state:
     st.session_state.last_ticker = None
+if 'fetch_errors' not in st.session_state:
+    st.session_state.fetch_errors = {}
 
 # Replace the Fetch Data button logic with:
 col1, col2 = st.columns([4, 1])
@@ -148,12 +104,17 @@ with col1:
                     progress_text = st.empty()
                     progress_text.text("Initializing data fetch...")
                     
-                    data = fetch_stock_data(selected_ticker, start_date, end_date)
+                    if batch_mode:
+                        data, errors = get_source("stocks").fetch_batch(selected_tickers, start_date, end_date, interval=interval)
+                    else:
+                        data, errors = fetch_stock_data(selected_ticker, start_date, end_date, interval), {}
                     
                     if data is not None and not data.empty:
                         progress_text.empty()
                         st.session_state.data = data
                         st.session_state.last_ticker = selected_ticker
+                        st.session_state.last_interval = interval
+                        st.session_state.fetch_errors = errors
                         st.success("Data fetched successfully!")
                     else:
                         st.error("Failed to fetch data. Please try again.")
@@ -166,6 +127,7 @@ with col2:
     if st.button("Clear", use_container_width=True):
         st.session_state.data = None
         st.session_state.last_ticker = None
+        st.session_state.fetch_errors = {}
         st.rerun()
 
 # Add this after the buttons
@@ -173,26 +135,22 @@ if st.session_state.data is not None:
     st.write(f"### Stock Data for {st.session_state.last_ticker}")
     st.write(st.session_state.data)
     
+    # Per-ticker error report for batch fetches
+    if st.session_state.fetch_errors:
+        with st.expander(f"{len(st.session_state.fetch_errors)} ticker(s) failed"):
+            st.table(pd.DataFrame(st.session_state.fetch_errors.items(), columns=['Ticker', 'Error']))
+    
     # Add column descriptions
     st.write("### Column Descriptions")
-    descriptions = {
-        'date': 'Date of the trading day',
-        'open': 'The price at market open',
-        'high': 'The highest price for that day',
-        'low': 'The lowest price for that day',
-        'close': 'The price at market close, adjusted for splits',
-        'adj_close': 'Closing price adjusted for splits and dividend distributions (CRSP standards)',
-        'volume': 'The number of shares traded on that day'
-    }
+    descriptions = get_source("stocks").schema(st.session_state.get('last_interval', "1d"))
     st.table(pd.DataFrame(descriptions.items(), columns=['Column', 'Description']))
     
-    # Export CSV with formatted columns
-    csv = st.session_state.data.to_csv(index=False)
-    st.download_button(
-        "Download CSV",
-        csv,
-        file_name=f"{st.session_state.last_ticker}_{start_date}_{end_date}.csv",
-        mime="text/csv"
+    # Export in the chosen format (CSV, compressed CSV, Parquet or Feather)
+    data_download(
+        st.session_state.data,
+        f"{st.session_state.last_ticker}_{start_date}_{end_date}".replace(" ", "_"),
+        key="stock_export",
+        label="Download"
     )
 
 # Sidebar with additional information
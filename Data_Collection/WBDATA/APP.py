@@ -1,11 +1,14 @@
+import sys
+from pathlib import Path
 import streamlit as st
-import pandas as pd
-import requests
-from io import StringIO
 import datetime as dt
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pandas_datareader import wb
+
+# Shared adapters and UI helpers live one level up, in Data_Collection/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from charts import chart_download, chart_zip_download, line_chart
+from datasources import get_source
+from datasources.worldbank.adapter import indicator_unit
+from explorer_ui import data_download, metric_cards, run_fetch, styled_table
 
 # Page config with dark theme
 st.set_page_config(
@@ -173,6 +176,26 @@ with st.sidebar:
         list(available_indicators.keys()),
         index=0
     )
+    selected_indicator_code = available_indicators[selected_indicator]
+    
+    # Search the full catalogue (answered from the local index)
+    indicator_query = st.text_input("Or search all indicators", placeholder="e.g. electricity access")
+    if indicator_query:
+        try:
+            matches = get_source("worldbank").search(indicator_query)
+        except Exception as e:
+            st.error(f"Error loading indicator catalogue: {str(e)}")
+            matches = None
+        if matches is not None and not matches.empty:
+            match_names = dict(zip(matches['id'], matches['name']))
+            selected_indicator_code = st.selectbox(
+                "Matching indicators",
+                list(match_names.keys()),
+                format_func=lambda code: f"{match_names[code]} ({code})"
+            )
+            selected_indicator = match_names[selected_indicator_code]
+        elif matches is not None:
+            st.caption("No matching indicators")
     
     # Region selection
     region = st.selectbox(
@@ -216,57 +239,37 @@ with st.sidebar:
 # DATA FETCHING FUNCTION (Updated for World Bank)
 # ==============================================
 
-@st.cache_data(ttl=24*3600)
 def fetch_wb_data(indicator_name, indicator_code, country_code, start_year, end_year):
-    """Fetches data from World Bank API"""
-    try:
-        # Get data using pandas_datareader
-        df = wb.download(
-            indicator=indicator_code,
-            country=[country_code],
-            start=start_year,
-            end=end_year
-        )
-        
-        if df.empty:
-            st.warning("No data available for the selected parameters")
-            return None
-            
-        # Clean up the dataframe
-        df = df.reset_index()
-        df = df.rename(columns={
-            'year': 'Year',
-            indicator_code: 'Value',
-            'country': 'Country'
-        })
-        
-        # Add additional metadata
-        df['Indicator'] = indicator_name
-        df['Country Code'] = country_code
-        
-        # Get units from World Bank metadata (simplified for demo)
-        unit_mapping = {
-            "current US$": "US$",
-            "annual %": "%",
-            "metric tons per capita": "tons/capita",
-            "% of land area": "%",
-            "% of total": "%",
-            "per 1,000 live births": "per 1000",
-            "per 1,000 people": "per 1000",
-            "% of people ages 15 and above": "%",
-            "% gross": "%",
-            "% of GDP": "%"
-        }
-        
-        unit = next((v for k, v in unit_mapping.items() if k in indicator_name), "")
-        df['Unit'] = unit
-        
-        return df
-    
-    except Exception as e:
-        st.error(f"Error fetching World Bank data: {str(e)}")
+    """Fetches data from World Bank API through the shared adapter (cached per query)"""
+    df = run_fetch(
+        get_source("worldbank"),
+        "World Bank",
+        indicator_code=indicator_code,
+        country_code=country_code,
+        start_year=start_year,
+        end_year=end_year
+    )
+    if df is None:
         return None
 
+    # Show the name picked in the sidebar rather than the API's long form
+    df['Indicator'] = indicator_name
+    return df
+
+def wb_chart(data, indicator, country, unit):
+    """(frame, x, y, spec) for an indicator's trend chart"""
+    return (
+        data,
+        "Year",
+        "Value",
+        {
+            "title": f"{indicator} Trend ({country})",
+            "xlabel": "Year",
+            "ylabel": f"{indicator} ({unit})",
+            "color": "#4CAF50",
+        }
+    )
+
 # ==============================================
 # MAIN DISPLAY (Adjusted for World Bank Data)
 # ==============================================
@@ -278,7 +281,7 @@ with col1:
         with st.spinner(f"Fetching {selected_indicator} data for {selected_country}..."):
             # Get country code
             country_code = COUNTRIES[region][selected_country]
-            indicator_code = INDICATORS[selected_category][selected_indicator]
+            indicator_code = selected_indicator_code
             
             # Fetch data
             df = fetch_wb_data(
@@ -293,6 +296,7 @@ with col1:
                 st.session_state.wb_data = df
                 st.session_state.current_query = {
                     "indicator": selected_indicator,
+                    "indicator_code": indicator_code,
                     "country": selected_country
                 }
                 st.success("Data loaded successfully!")
@@ -306,43 +310,24 @@ if 'wb_data' in st.session_state:
     st.markdown("---")
     st.markdown("<h3 style='color: #4CAF50;'>Key Metrics</h3>", unsafe_allow_html=True)
     
-    # Filter out NA values for calculations
-    clean_df = df.dropna(subset=['Value'])
+    metric_cards(df)
     
-    if not clean_df.empty:
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(
-                "First Year Value", 
-                f"{clean_df.iloc[0]['Value']:,.2f} {clean_df.iloc[0]['Unit']}",
-                help=f"Value in {clean_df.iloc[0]['Year']}"
-            )
-        with col2:
-            st.metric(
-                "Last Year Value", 
-                f"{clean_df.iloc[-1]['Value']:,.2f} {clean_df.iloc[-1]['Unit']}",
-                help=f"Value in {clean_df.iloc[-1]['Year']}"
-            )
-        with col3:
-            change = ((clean_df.iloc[-1]['Value'] - clean_df.iloc[0]['Value']) / clean_df.iloc[0]['Value']) * 100
-            st.metric(
-                "Change Over Period", 
-                f"{change:.1f}%",
-                delta_color="inverse" if change < 0 else "normal",
-                help=f"Percentage change from {clean_df.iloc[0]['Year']} to {clean_df.iloc[-1]['Year']}"
-            )
-    else:
-        st.warning("No valid data points available for metrics calculation")
+    # Filter out NA values for the charts
+    clean_df = df.dropna(subset=['Value'])
     
     # Main dataframe with better contrast
     st.markdown("---")
     st.markdown(f"<h3 style='color: #4CAF50;'>{query['indicator']} in {query['country']}</h3>", unsafe_allow_html=True)
-    st.dataframe(
-        df.style.applymap(lambda x: 'color: #B0B0B0' if isinstance(x, str) else 'color: white'),
-        hide_index=True,
-        use_container_width=True,
-        height=min(400, 35 * (len(df) + 1))
-    )
+    
+    # Indicator definition from the local catalogue (no API call on rerun)
+    try:
+        definition = get_source("worldbank").metadata(query.get('indicator_code', ''))
+        if definition and definition['note']:
+            st.markdown(f"**Definition:** *{definition['note']}*")
+    except Exception:
+        # The definition is informational only; the data view works without it
+        pass
+    styled_table(df, key="wb_table")
     
     # Visualization tabs with dark theme charts
     st.markdown("---")
@@ -350,42 +335,7 @@ if 'wb_data' in st.session_state:
     
     with tab1:
         if not clean_df.empty:
-            # Set dark background for matplotlib
-            plt.style.use('dark_background')
-            fig, ax = plt.subplots(figsize=(10, 5))
-            
-            # Create plot with better contrast
-            sns.lineplot(
-                data=clean_df, 
-                x="Year", 
-                y="Value", 
-                marker="o",
-                color="#4CAF50",
-                linewidth=2.5,
-                markersize=8
-            )
-            
-            # Customize plot appearance
-            ax.set_facecolor('#1E1E1E')
-            ax.grid(color='#2E2E2E', linestyle='--', linewidth=0.5)
-            ax.set_title(
-                f"{query['indicator']} Trend ({query['country']})",
-                color='white',
-                pad=20,
-                fontsize=14
-            )
-            ax.set_xlabel("Year", color='#B0B0B0')
-            ax.set_ylabel(
-                f"{query['indicator']} ({clean_df.iloc[0]['Unit']})", 
-                color='#B0B0B0'
-            )
-            
-            # Rotate x-axis labels for better readability
-            plt.xticks(rotation=45)
-            
-            # Adjust layout to prevent label cutoff
-            plt.tight_layout()
-            st.pyplot(fig)
+            line_chart(*wb_chart(clean_df, query['indicator'], query['country'], clean_df.iloc[0]['Unit']))
         else:
             st.warning("No valid data points available for visualization")
     
@@ -417,24 +367,98 @@ if 'wb_data' in st.session_state:
     st.markdown("<h3 style='color: #4CAF50;'>Export Data</h3>", unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
-        csv = df.to_csv(index=False)
-        st.download_button(
-            "💾 Download CSV",
-            csv,
-            file_name=f"WorldBank_{query['indicator'].replace(' ', '_')}_{query['country']}.csv",
-            mime="text/csv",
+        data_download(
+            df,
+            f"WorldBank_{query['indicator'].replace(' ', '_')}_{query['country']}",
+            key="wb_export",
             use_container_width=True
         )
     with col2:
-        # In a real implementation, this would export the chart
-        st.download_button(
-            "📊 Download Chart as PNG",
-            b"",  # Placeholder for actual implementation
-            file_name="WorldBank_chart.png",
-            disabled=True,
-            use_container_width=True,
-            help="Coming soon - will export the visualization as PNG"
-        )
+        if not clean_df.empty:
+            chart_download(
+                *wb_chart(clean_df, query['indicator'], query['country'], clean_df.iloc[0]['Unit']),
+                f"WorldBank_{query['indicator'].replace(' ', '_')}_{query['country']}",
+                key="wb_chart",
+                use_container_width=True
+            )
+
+# ==============================================
+# MULTI-COUNTRY PANEL (Bulk fetch)
+# ==============================================
+
+class PartialPanel(Exception):
+    """Carries a panel with failed indicators out of the cached fetch, so it is not cached"""
+
+
+@st.cache_data(ttl=24*3600)
+def fetch_complete_wb_panel(indicator_codes, country_codes, start_year, end_year):
+    panel, errors = get_source("worldbank").fetch_panel(indicator_codes, country_codes, start_year, end_year)
+    if errors:
+        # Exceptions are never cached, so a transient failure is retried on the next fetch
+        raise PartialPanel(panel, errors)
+    return panel, errors
+
+
+def fetch_wb_panel_data(indicator_codes, country_codes, start_year, end_year):
+    """Fetches an indicators x countries panel with batched World Bank API calls
+
+    Only panels where every indicator succeeded are cached.
+    """
+    try:
+        return fetch_complete_wb_panel(indicator_codes, country_codes, start_year, end_year)
+    except PartialPanel as partial:
+        return partial.args
+
+st.markdown("---")
+with st.expander("🌐 Multi-Country, Multi-Indicator Panel"):
+    all_indicators = {name: code for category in INDICATORS.values() for name, code in category.items()}
+    all_countries = {name: code for group in COUNTRIES.values() for name, code in group.items()}
+    
+    panel_indicators = st.multiselect("Indicators", list(all_indicators.keys()))
+    panel_countries = st.multiselect("Countries", list(all_countries.keys()))
+    
+    if st.button("🚀 Fetch Panel", use_container_width=True):
+        if not panel_indicators or not panel_countries:
+            st.warning("Select at least one indicator and one country")
+        else:
+            with st.spinner(f"Fetching {len(panel_indicators)} indicators for {len(panel_countries)} countries..."):
+                try:
+                    panel, errors = fetch_wb_panel_data(
+                        tuple(all_indicators[name] for name in panel_indicators),
+                        tuple(all_countries[name] for name in panel_countries),
+                        year_range[0],
+                        year_range[1]
+                    )
+                    st.session_state.wb_panel = panel
+                    st.session_state.wb_panel_errors = errors
+                except Exception as e:
+                    st.error(f"Error fetching World Bank panel: {str(e)}")
+    
+    if 'wb_panel' in st.session_state:
+        panel = st.session_state.wb_panel
+        for indicator, error in st.session_state.wb_panel_errors.items():
+            st.warning(f"{indicator}: {error}")
+        if panel.empty:
+            st.warning("No data available for the selected parameters")
+        else:
+            styled_table(panel, key="wb_panel_table")
+            data_download(panel, "WorldBank_panel", key="wb_panel_export", label="💾 Download Panel",
+                          use_container_width=True)
+            
+            # One chart per indicator and country of the panel, rendered in worker processes
+            series = panel.dropna(subset=['Value']).groupby(['Indicator Code', 'Country Code'], sort=False)
+            chart_zip_download(
+                lambda: [
+                    (f"WorldBank_{indicator_code}_{country_code}",
+                     *wb_chart(group, group['Indicator'].iloc[0], group['Country'].iloc[0],
+                               indicator_unit(group['Indicator'].iloc[0])))
+                    for (indicator_code, country_code), group in series
+                ],
+                series.ngroups,
+                "WorldBank_panel_charts",
+                key="wb_panel_charts",
+                use_container_width=True
+            )
 
 # ==============================================
 # FOOTER (Updated for World Bank)
@@ -444,6 +468,6 @@ st.markdown("---")
 st.markdown("""
 <div style="text-align: center; color: #B0B0B0; padding: 20px;">
     <p>Data sourced from <a href="https://data.worldbank.org" target="_blank" style="color: #4CAF50;">World Bank Open Data</a></p>
-    <p style="font-size: 0.8em;">Note: This app uses the World Bank API via pandas_datareader</p>
+    <p style="font-size: 0.8em;">Note: This app uses the World Bank Indicators API</p>
 </div>
 """, unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,321 @@
+"""Cached, downsampled time-series charts for the explorers
+
+Charts are drawn on standalone matplotlib Figures (never registered with
+pyplot, so nothing accumulates across reruns) and the encoded image is
+cached by (data fingerprint, chart spec, style, format). A rerun caused by
+an unrelated widget reuses the cached bytes instead of re-plotting, and
+long series are reduced with LTTB or min-max before they are drawn.
+
+Chart downloads (PNG, SVG, PDF) reuse the same cache, and batch exports
+render their cache misses in a pool of worker processes.
+"""
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import streamlit as st
+from matplotlib.figure import Figure
+
+from datasources.base import ResultCache, SingleFlight
+from explorer_ui import frame_fingerprint
+
+# Points drawn per series; a 10-inch figure cannot show more than this anyway
+DEFAULT_MAX_POINTS = 1000
+
+# Markers are only drawn on short series, where individual points are readable
+MARKER_MAX_POINTS = 150
+
+# Dark theme shared by the explorers (matplotlib's dark_background colours, set per figure)
+DARK_STYLE = {
+    "figsize": (10, 5),
+    "dpi": 150,
+    "figcolor": "black",
+    "facecolor": "#1E1E1E",
+    "edgecolor": "white",
+    "tickcolor": "white",
+    "gridcolor": "#2E2E2E",
+    "titlecolor": "white",
+    "labelcolor": "#B0B0B0",
+}
+
+# format -> (label, MIME type) for chart downloads
+CHART_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "svg": ("SVG", "image/svg+xml"),
+    "pdf": ("PDF", "application/pdf"),
+}
+
+# Worker processes for batch chart exports
+DEFAULT_BATCH_WORKERS = min(4, os.cpu_count() or 1)
+
+# Rendered charts, shared across sessions: identical data and spec give identical images
+CHART_CACHE = ResultCache(ttl_seconds=3600, max_entries=128)
+_renders = SingleFlight()
+
+
+def _numeric(x):
+    # Datetimes are downsampled on their int64 representation
+    x = np.asarray(x)
+    return x.view("int64").astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+
+
+def lttb_indices(x, y, threshold):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average, which preserves the visual shape of the line.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _numeric(x), np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs((x[previous] - avg_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+def minmax_indices(y, threshold):
+    """Indices of the minimum and maximum of each of threshold // 2 buckets, in order
+
+    Cheaper than LTTB and keeps every spike, which suits noisy daily data.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, threshold // 2 + 1).astype(np.int64)
+    indices = [0, n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            bucket = y[start:stop]
+            indices += [start + int(np.argmin(bucket)), start + int(np.argmax(bucket))]
+    return np.unique(indices)
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Returns (x, y) reduced to at most max_points points"""
+    if method == "minmax":
+        kept = minmax_indices(y, max_points)
+    elif method == "lttb":
+        kept = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'. Use 'lttb' or 'minmax'.")
+    return np.asarray(x)[kept], np.asarray(y)[kept]
+
+
+def render_line_chart(x, y, spec, style=DARK_STYLE, fmt="png"):
+    """Draws one line chart and returns the encoded image bytes
+
+    spec holds title, xlabel, ylabel and color. Plain function of its
+    arguments, so it can also run in a worker process. Every colour is set
+    on the figure itself: a style context would change matplotlib's global
+    rcParams under the other sessions' threads.
+    """
+    fig = Figure(figsize=style["figsize"], facecolor=style["figcolor"], edgecolor=style["figcolor"])
+    try:
+        ax = fig.subplots()
+        ax.plot(
+            x, y,
+            color=spec["color"],
+            linewidth=2.5,
+            marker="o" if len(x) <= MARKER_MAX_POINTS else None,
+            markersize=8
+        )
+
+        # Customize plot appearance
+        ax.set_facecolor(style["facecolor"])
+        for spine in ax.spines.values():
+            spine.set_edgecolor(style["edgecolor"])
+        ax.tick_params(colors=style["tickcolor"])
+        ax.grid(color=style["gridcolor"], linestyle="--", linewidth=0.5)
+        ax.set_title(spec["title"], color=style["titlecolor"], pad=20, fontsize=14)
+        ax.set_xlabel(spec["xlabel"], color=style["labelcolor"])
+        ax.set_ylabel(spec["ylabel"], color=style["labelcolor"])
+
+        # Rotate x-axis labels for better readability
+        ax.tick_params(axis="x", labelrotation=45)
+
+        # Adjust layout to prevent label cutoff
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=style["dpi"], facecolor=style["figcolor"])
+        return buffer.getvalue()
+    finally:
+        # Drop every artist now rather than whenever the figure is collected
+        fig.clear()
+
+
+def chart_points(df, x, y, max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Non-missing (x, y) arrays of a frame in x order, downsampled for drawing"""
+    data = df[[x, y]].dropna()
+    if not data[x].is_monotonic_increasing:
+        data = data.sort_values(x, kind="stable")
+    return downsample(data[x].to_numpy(), data[y].to_numpy(), max_points, method)
+
+
+def _freeze(mapping):
+    return tuple(sorted(mapping.items()))
+
+
+def _chart_key(df, x, y, spec, style, fmt, max_points, method):
+    return (frame_fingerprint(df[[x, y]]), x, y, _freeze(spec), _freeze(style), fmt, max_points, method)
+
+
+def chart_bytes(df, x, y, spec, style=DARK_STYLE, fmt="png", max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Encoded line chart of df[y] against df[x], served from the chart cache"""
+    key = _chart_key(df, x, y, spec, style, fmt, max_points, method)
+    image = CHART_CACHE.get(key)
+    if image is None:
+        def render():
+            points_x, points_y = chart_points(df, x, y, max_points, method)
+            return render_line_chart(points_x, points_y, spec, style, fmt)
+        # Sessions asking for the same chart at once share one render
+        image, shared = _renders.do(key, render)
+        if not shared:
+            CHART_CACHE.put(key, image)
+    return image
+
+
+def line_chart(df, x, y, spec, style=DARK_STYLE, **kwargs):
+    """Shows a cached, downsampled line chart in the page"""
+    st.image(chart_bytes(df, x, y, spec, style, **kwargs), use_container_width=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # Spawned rather than forked: the server process runs threads (Streamlit, the HTTP loop)
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=DEFAULT_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool(pool):
+    # A worker that died (e.g. killed for memory) breaks the whole pool for good
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_in_pool(jobs):
+    """Renders {index: render_line_chart args} in the worker pool, with one retry on a fresh pool
+
+    Falls back to rendering in this process if the fresh pool breaks too.
+    """
+    for _ in range(2):
+        pool = _get_pool()
+        try:
+            futures = {i: pool.submit(render_line_chart, *args) for i, args in jobs.items()}
+            return {i: future.result() for i, future in futures.items()}
+        except BrokenProcessPool:
+            _discard_pool(pool)
+    return {i: render_line_chart(*args) for i, args in jobs.items()}
+
+
+def render_charts(charts, style=DARK_STYLE, fmt="png", max_points=DEFAULT_MAX_POINTS, method="lttb"):
+    """Encoded images for many (df, x, y, spec) charts, in order
+
+    Cached charts are reused; the others are downsampled here and rendered
+    in worker processes, so a big batch runs on several cores.
+    """
+    keys = [_chart_key(df, x, y, spec, style, fmt, max_points, method) for df, x, y, spec in charts]
+    images = [CHART_CACHE.get(key) for key in keys]
+    missing = [i for i, image in enumerate(images) if image is None]
+    if len(missing) == 1:
+        df, x, y, spec = charts[missing[0]]
+        images[missing[0]] = chart_bytes(df, x, y, spec, style, fmt, max_points, method)
+    elif missing:
+        jobs = {}
+        for i in missing:
+            df, x, y, spec = charts[i]
+            # Workers only receive the downsampled points, not the frame
+            points_x, points_y = chart_points(df, x, y, max_points, method)
+            jobs[i] = (points_x, points_y, spec, style, fmt)
+        for i, image in _render_in_pool(jobs).items():
+            images[i] = image
+            CHART_CACHE.put(keys[i], image)
+    return images
+
+
+def chart_zip(named_charts, fmt="png", style=DARK_STYLE):
+    """Zip archive with one image per (name, df, x, y, spec)"""
+    images = render_charts([chart[1:] for chart in named_charts], style, fmt)
+    buffer = io.BytesIO()
+    # PNG and PDF are compressed already; SVG is text and shrinks a lot
+    compression = zipfile.ZIP_DEFLATED if fmt == "svg" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(buffer, "w", compression=compression) as archive:
+        for (name, *_), image in zip(named_charts, images):
+            archive.writestr(f"{name}.{fmt}", image)
+    return buffer.getvalue()
+
+
+def _format_picker(key):
+    return st.selectbox("Chart format", list(CHART_FORMATS),
+                        format_func=lambda f: CHART_FORMATS[f][0], key=f"{key}_format")
+
+
+def chart_download(df, x, y, spec, base_name, key, style=DARK_STYLE, **kwargs):
+    """Format picker plus download button for a chart already shown with line_chart"""
+    fmt = _format_picker(key)
+    label, mime = CHART_FORMATS[fmt]
+    st.download_button(
+        f"📊 Download Chart as {label}",
+        # Same arguments as line_chart, so PNG comes straight from the cache
+        chart_bytes(df, x, y, spec, style, fmt=fmt),
+        file_name=f"{base_name}.{fmt}",
+        mime=mime,
+        key=f"{key}_download",
+        **kwargs
+    )
+
+
+def chart_zip_download(build_charts, count, base_name, key, style=DARK_STYLE, **kwargs):
+    """Batch chart export: build_charts() returns [(name, df, x, y, spec), ...]
+
+    Nothing is fetched or rendered until the user asks for the archive.
+    """
+    fmt = _format_picker(key)
+    if st.button(f"🖼️ Render {count} charts", key=f"{key}_prepare", disabled=not count, **kwargs):
+        with st.spinner(f"Rendering {count} charts..."):
+            named_charts = build_charts()
+            if named_charts:
+                st.session_state[f"{key}_zip"] = (fmt, chart_zip(named_charts, fmt, style))
+            else:
+                st.warning("No data available for the selected charts")
+
+    prepared = st.session_state.get(f"{key}_zip")
+    if prepared is not None:
+        st.download_button(
+            f"📦 Download charts ({CHART_FORMATS[prepared[0]][0]}, zip)",
+            prepared[1],
+            file_name=f"{base_name}_{prepared[0]}.zip",
+            mime="application/zip",
+            key=f"{key}_download",
+            **kwargs
+        )
@@ -0,0 +1,33 @@
+import importlib
+import threading
+
+from .base import DATA_DIR, INSTRUMENTATION, RESULT_CACHE, DataSource, NoDataError
+
+# Source name -> adapter class, imported on first use so each explorer only
+# needs the client libraries of the sources it actually touches
+SOURCES = {
+    "stocks": "stocks.adapter:StockSource",
+    "eurostat": "eurostat.adapter:EurostatSource",
+    "worldbank": "worldbank.adapter:WorldBankSource",
+    "faostat": "faostat.adapter:FaostatSource",
+    "faostat_simulated": "faostat.adapter:SimulatedFaostatSource",
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def source_class(name):
+    """Returns the adapter class registered under name"""
+    if name not in SOURCES:
+        raise KeyError(f"Unknown data source '{name}'. Available: {', '.join(SOURCES)}")
+    module, cls = SOURCES[name].split(":")
+    return getattr(importlib.import_module(f".{module}", __name__), cls)
+
+
+def get_source(name):
+    """Returns the process-wide adapter for name, so stores and caches are shared"""
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = source_class(name)()
+        return _instances[name]
@@ -0,0 +1,197 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger("datasources")
+
+# Root of every local store and cache, overridable for deployments
+DATA_DIR = Path(os.environ.get(
+    "DATA_COLLECTION_DIR",
+    str(Path(__file__).resolve().parent.parent / "data")
+))
+
+# Results kept by the shared fetch cache
+DEFAULT_CACHE_TTL = 24 * 3600
+DEFAULT_CACHE_ENTRIES = 256
+
+
+class NoDataError(LookupError):
+    """Raised when a query succeeds but matches no observations"""
+
+
+class ResultCache:
+    """Thread-safe in-memory LRU cache with a per-entry TTL"""
+
+    def __init__(self, ttl_seconds=DEFAULT_CACHE_TTL, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored, value = entry
+            if time.time() - stored > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution
+
+    The first caller for a key runs fn; callers arriving while it is in flight
+    wait and receive the same result (or exception) instead of repeating it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Returns (result, shared), where shared is True for callers that waited"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class Instrumentation:
+    """Per-source counters for calls, cache hits, coalesced calls, errors, rows and time spent"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, source, seconds, rows=0, cached=False, coalesced=False, error=None):
+        with self._lock:
+            stats = self._stats.setdefault(source, {
+                "calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0, "rows": 0, "seconds": 0.0
+            })
+            stats["calls"] += 1
+            stats["cache_hits"] += int(cached)
+            stats["coalesced"] += int(coalesced)
+            stats["errors"] += int(error is not None)
+            stats["rows"] += rows
+            stats["seconds"] += seconds
+        if error is not None:
+            logger.warning("%s fetch failed after %.2fs: %s", source, seconds, error)
+        else:
+            note = " (cached)" if cached else " (coalesced)" if coalesced else ""
+            logger.info("%s fetch: %d rows in %.3fs%s", source, rows, seconds, note)
+
+    def snapshot(self):
+        with self._lock:
+            return {source: dict(stats) for source, stats in self._stats.items()}
+
+
+# Shared by every adapter in the process
+RESULT_CACHE = ResultCache()
+INSTRUMENTATION = Instrumentation()
+IN_FLIGHT = SingleFlight()
+
+
+def _freeze(value):
+    # Make query arguments hashable so they can key the result cache
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class DataSource:
+    """Common interface implemented by every data-source adapter
+
+    Subclasses implement _fetch(**query) returning a DataFrame (raising
+    NoDataError when nothing matches), metadata(**query) returning a dict of
+    labels/units/definitions, and schema() describing the output columns.
+    fetch() adds the shared result cache, coalescing of identical concurrent
+    queries and instrumentation on top.
+    """
+
+    name = None
+
+    # Column name -> description of the frame returned by fetch()
+    columns = {}
+
+    def __init__(self, cache=RESULT_CACHE, instrumentation=INSTRUMENTATION, in_flight=IN_FLIGHT):
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self.in_flight = in_flight
+
+    def _fetch(self, **query):
+        raise NotImplementedError
+
+    def fetch(self, use_cache=True, **query):
+        """Returns the query result, serving repeated queries from the shared cache"""
+        key = (self.name, _freeze(query))
+        started = time.perf_counter()
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.instrumentation.record(self.name, time.perf_counter() - started, len(cached), cached=True)
+                # Callers add derived columns, so never hand out the cached object itself
+                return cached.copy()
+        try:
+            # Identical queries already running (e.g. from another session) are awaited, not repeated
+            df, shared = self.in_flight.do(key, lambda: self._fetch(**query))
+        except Exception as e:
+            self.instrumentation.record(self.name, time.perf_counter() - started, error=e)
+            raise
+        if df is None or df.empty:
+            self.instrumentation.record(self.name, time.perf_counter() - started, coalesced=shared)
+            raise NoDataError("No data available for the selected parameters")
+        self.instrumentation.record(self.name, time.perf_counter() - started, len(df), coalesced=shared)
+        if use_cache and self.cache is not None and not shared:
+            self.cache.put(key, df)
+        return df.copy()
+
+    def metadata(self, **query):
+        return {}
+
+    def schema(self):
+        return dict(self.columns)
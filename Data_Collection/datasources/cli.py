@@ -0,0 +1,246 @@
+"""Headless batch extraction for scheduled jobs
+
+Run from Data_Collection/:
+
+    python -m datasources jobs.json [--output DIR] [--format FORMAT] [--workers N]
+
+The job spec is a JSON file:
+
+    {
+      "output": "exports/nightly",
+      "format": "parquet",
+      "max_workers": 8,
+      "jobs": [
+        {"source": "stocks", "tickers": ["AAPL", "MSFT"],
+         "start_date": "2020-01-01", "end_date": "2024-12-31"},
+        {"source": "stocks", "tickers": ["AAPL"], "interval": "5m",
+         "start_date": "2025-01-01", "end_date": "2025-01-31"},
+        {"source": "worldbank", "indicators": ["NY.GDP.MKTP.CD"],
+         "countries": ["USA", "DEU"], "start_year": 2000, "end_year": 2023},
+        {"source": "eurostat", "datasets": ["nama_10_gdp"], "countries": ["DE", "FR"],
+         "start_year": 2010, "end_year": 2023, "filters": {"unit": ["CP_MEUR"]}},
+        {"source": "faostat", "domain": "QCL", "items": [15], "areas": [100],
+         "start_year": 2000, "end_year": 2022}
+      ]
+    }
+
+Each job expands into one task per ticker, indicator, dataset x country or
+item x area. Tasks run concurrently and each result is written to a hive
+partition under <output>/<run id>/, next to a run_manifest.json listing
+every task with its status, row count, output file and timing. Formats are
+those of datasources.export (parquet, feather, csv, csv.gz, csv.zst). The exit
+status is 1 if any task failed.
+"""
+import argparse
+import datetime as dt
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from . import INSTRUMENTATION, get_source
+from .base import DATA_DIR, NoDataError
+from .export import EXPORT_FORMATS, export_file_name, write_export
+
+DEFAULT_OUTPUT_DIR = DATA_DIR / "exports"
+DEFAULT_FORMAT = "parquet"
+DEFAULT_MAX_WORKERS = 8
+FORMATS = tuple(EXPORT_FORMATS)
+
+logger = logging.getLogger("datasources.cli")
+
+
+def _stock_tasks(job):
+    interval = job.get("interval", "1d")
+    for ticker in job["tickers"]:
+        query = {"ticker": ticker, "start_date": job["start_date"], "end_date": job["end_date"]}
+        if interval == "1d":
+            yield ("stocks", query, {"ticker": ticker})
+        else:
+            yield ("stocks", {**query, "interval": interval}, {"interval": interval, "ticker": ticker})
+
+
+def _worldbank_tasks(job):
+    # The API takes many countries per call, so one task covers a whole indicator
+    for indicator in job["indicators"]:
+        yield ("worldbank",
+               {"indicator_code": indicator, "country_code": list(job["countries"]),
+                "start_year": job["start_year"], "end_year": job["end_year"]},
+               {"indicator": indicator})
+
+
+def _eurostat_tasks(job):
+    for dataset in job["datasets"]:
+        for country in job["countries"]:
+            yield ("eurostat",
+                   {"dataset_code": dataset, "country_code": country,
+                    "start_year": job["start_year"], "end_year": job["end_year"],
+                    "dimension_filters": job.get("filters") or None},
+                   {"dataset": dataset, "geo": country})
+
+
+def _faostat_tasks(job):
+    items, areas = job["items"], job["areas"]
+    for item in items:
+        for area in areas:
+            yield ("faostat",
+                   {"domain_code": job["domain"], "item_code": item, "area_code": area,
+                    "start_year": job.get("start_year"), "end_year": job.get("end_year"),
+                    # Ingest every requested item and area in one pass over the bulk file
+                    "ingest_item_codes": tuple(items), "ingest_area_codes": tuple(areas)},
+                   {"domain": job["domain"], "item": item, "area": area})
+
+
+TASK_BUILDERS = {
+    "stocks": _stock_tasks,
+    "worldbank": _worldbank_tasks,
+    "eurostat": _eurostat_tasks,
+    "faostat": _faostat_tasks,
+}
+
+
+def load_spec(path):
+    """Reads and validates a job spec file"""
+    with open(path) as f:
+        spec = json.load(f)
+    if not isinstance(spec.get("jobs"), list) or not spec["jobs"]:
+        raise ValueError("Job spec must contain a non-empty 'jobs' list")
+    for i, job in enumerate(spec["jobs"]):
+        if job.get("source") not in TASK_BUILDERS:
+            raise ValueError(f"Job {i}: unknown source '{job.get('source')}'. "
+                             f"Available: {', '.join(TASK_BUILDERS)}")
+    if spec.get("format", DEFAULT_FORMAT) not in FORMATS:
+        raise ValueError(f"Unsupported format '{spec['format']}'. Available: {', '.join(FORMATS)}")
+    return spec
+
+
+def expand_tasks(spec):
+    """Returns the (source, query, partition) triples for every job in the spec"""
+    tasks = []
+    for i, job in enumerate(spec["jobs"]):
+        try:
+            tasks.extend(TASK_BUILDERS[job["source"]](job))
+        except KeyError as e:
+            raise ValueError(f"Job {i} ({job['source']}) is missing {e}") from None
+    return tasks
+
+
+def partition_path(root, source, partition):
+    """Hive-style directory for one task, e.g. source=stocks/ticker=AAPL"""
+    path = Path(root) / f"source={source}"
+    for key, value in partition.items():
+        # Keep partition values filesystem-safe (tickers like BRK-B, ^GSPC or 2222.SR)
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(value))
+        path = path / f"{key}={safe}"
+    return path
+
+
+def write_frame(df, directory, fmt):
+    """Writes one task's frame atomically and returns the file path"""
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / export_file_name("part-0", fmt)
+    tmp = directory / f".{target.name}.tmp"
+    write_export(df, str(tmp), fmt)
+    os.replace(tmp, target)
+    return target
+
+
+def run_task(source, query, partition, run_dir, fmt):
+    """Fetches and writes one task, returning its manifest entry (never raises)"""
+    entry = {"source": source, "partition": partition, "status": "ok", "rows": 0, "path": None, "error": None}
+    started = time.perf_counter()
+    try:
+        df = get_source(source).fetch(**query)
+        path = write_frame(df, partition_path(run_dir, source, partition), fmt)
+        entry["rows"] = len(df)
+        entry["path"] = str(path.relative_to(run_dir))
+    except NoDataError as e:
+        # Empty results are expected for some combinations and are not failures;
+        # a KeyError from a bug or a malformed payload still counts as failed
+        entry["status"] = "empty"
+        entry["error"] = str(e)
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("%s %s: %s (%d rows)", source, partition, entry["status"], entry["rows"])
+    return entry
+
+
+def run_spec(spec, output=None, fmt=None, max_workers=None, run_id=None):
+    """Runs every task of a spec concurrently and writes the run manifest
+
+    Returns the manifest dict.
+    """
+    fmt = fmt or spec.get("format", DEFAULT_FORMAT)
+    max_workers = max_workers or spec.get("max_workers", DEFAULT_MAX_WORKERS)
+    run_id = run_id or dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_dir = Path(output or spec.get("output") or DEFAULT_OUTPUT_DIR) / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = expand_tasks(spec)
+    started = dt.datetime.now(dt.timezone.utc)
+    entries = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        futures = [executor.submit(run_task, source, query, partition, run_dir, fmt)
+                   for source, query, partition in tasks]
+        for future in as_completed(futures):
+            entries.append(future.result())
+
+    # Stable order regardless of completion order
+    entries.sort(key=lambda e: (e["source"], json.dumps(e["partition"], sort_keys=True, default=str)))
+    manifest = {
+        "run_id": run_id,
+        "started": started.isoformat(),
+        "finished": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "format": fmt,
+        "spec": spec,
+        "summary": {
+            "tasks": len(entries),
+            "ok": sum(e["status"] == "ok" for e in entries),
+            "empty": sum(e["status"] == "empty" for e in entries),
+            "failed": sum(e["status"] == "failed" for e in entries),
+            "rows": sum(e["rows"] for e in entries),
+        },
+        "sources": INSTRUMENTATION.snapshot(),
+        "tasks": entries,
+    }
+    tmp = run_dir / ".run_manifest.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp, run_dir / "run_manifest.json")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m datasources",
+                                     description="Run a batch extraction job spec without Streamlit.")
+    parser.add_argument("spec", help="Path to the JSON job spec")
+    parser.add_argument("--output", help="Output root (overrides the spec)")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (overrides the spec)")
+    parser.add_argument("--workers", type=int, help="Concurrent tasks (overrides the spec)")
+    parser.add_argument("--run-id", help="Run directory name (default: UTC timestamp)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every task")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    try:
+        spec = load_spec(args.spec)
+        manifest = run_spec(spec, output=args.output, fmt=args.format,
+                            max_workers=args.workers, run_id=args.run_id)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    summary = manifest["summary"]
+    print(f"Run {manifest['run_id']}: {summary['ok']} ok, {summary['empty']} empty, "
+          f"{summary['failed']} failed, {summary['rows']} rows")
+    for entry in manifest["tasks"]:
+        if entry["status"] == "failed":
+            print(f"  {entry['source']} {entry['partition']}: {entry['error']}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
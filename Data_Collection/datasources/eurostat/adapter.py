@@ -0,0 +1,134 @@
+import aiohttp
+import eurostat
+
+from ..aio import TRANSPORT_ERRORS
+from ..base import DataSource, NoDataError
+from .api import dimension_labels, fetch_dataset_slice
+from .dataset_cache import DatasetCache
+from .metadata_index import MetadataIndex
+from .reshape import add_period_columns, reshape_wide, select_period_columns
+
+
+def _bulk_fallback_allowed(error):
+    """True for failures the full bulk download can work around
+
+    Connection errors, timeouts, 413 (extraction too large) and 5xx. Other
+    4xx answers (unknown geo, bad filter) would be just as empty in bulk.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 413 or error.status >= 500
+    return True
+
+
+class EurostatSource(DataSource):
+    """Eurostat datasets, served from the raw-dataset cache or a server-side filtered slice"""
+
+    name = "eurostat"
+
+    columns = {
+        'Year': 'Calendar year of the observation',
+        'period': 'Eurostat period label (2020, 2020-Q1, 2020-01, ...)',
+        'sub_period': 'Quarter, month or day within the year (0 for annual data)',
+        'Country Code': 'Eurostat geo code',
+        'Value': 'Observation value',
+        'Unit': 'Unit of measure'
+    }
+
+    def __init__(self, dataset_cache=None, metadata_index=None, **kwargs):
+        super().__init__(**kwargs)
+        self.dataset_cache = dataset_cache or DatasetCache()
+        self.metadata_index = metadata_index or MetadataIndex()
+
+    def _fetch_full(self, dataset_code, country_code, start_year, end_year, dimension_filters=None):
+        """Serves a country slice from the raw-dataset cache, downloading the dataset once"""
+        cache = self.dataset_cache
+
+        # Get the dataset (only on a cache miss, independent of country and years)
+        if not cache.get_or_load(dataset_code, lambda: eurostat.get_data_df(dataset_code, flags=False)):
+            return None
+
+        # Properly handle the geo\time column (with backslash)
+        columns = cache.columns(dataset_code)
+        geo_time_col = [col for col in columns if 'geo' in col.lower() and 'time' in col.lower()]
+
+        if not geo_time_col:
+            raise ValueError("Could not find geo\\time column in the dataset")
+
+        geo_time_col = geo_time_col[0]  # Get the actual column name
+
+        # Prune out-of-range period columns using the header alone
+        id_vars, period_cols = select_period_columns(columns, start_year, end_year)
+
+        # Filter for the selected country and dimensions while reading from the cache
+        filters = [(geo_time_col, '==', country_code)]
+        filters += [(dim, 'in', list(codes)) for dim, codes in (dimension_filters or {}).items() if dim in columns]
+        df = cache.read(dataset_code, filters=filters, columns=id_vars + period_cols)
+
+        if df.empty:
+            return None
+
+        # Reshape the data from wide to long format with typed period columns
+        return reshape_wide(df).rename(columns={geo_time_col: 'geo'})
+
+    def _fetch_slice(self, dataset_code, country_code, start_year, end_year, dimension_filters=None):
+        """Requests only the selected country, years and dimensions from the Eurostat API"""
+        df, payload = fetch_dataset_slice(
+            dataset_code,
+            geo=country_code,
+            start_year=start_year,
+            end_year=end_year,
+            filters=dimension_filters
+        )
+
+        # The response carries labels for every dimension it contains; keep them locally
+        self.metadata_index.merge(
+            dataset_code,
+            {dim: dimension_labels(payload, dim) for dim in payload.get("id", [])}
+        )
+
+        if df.empty:
+            return None
+
+        df = add_period_columns(df)
+
+        # The API filters on time already; this guards against servers that ignore it
+        return df[(df['year'] >= start_year) & (df['year'] <= end_year)]
+
+    def _fetch(self, dataset_code, country_code, start_year, end_year, dimension_filters=None):
+        try:
+            if self.dataset_cache.contains(dataset_code):
+                # The full dataset is already local, so no request is needed at all
+                df = self._fetch_full(dataset_code, country_code, start_year, end_year, dimension_filters)
+            else:
+                df = self._fetch_slice(dataset_code, country_code, start_year, end_year, dimension_filters)
+        except TRANSPORT_ERRORS as error:
+            if not _bulk_fallback_allowed(error):
+                if error.status == 429:
+                    # Still rate limited after the client's retries; not an empty answer
+                    raise
+                raise NoDataError(
+                    f"Eurostat rejected the query for {dataset_code} ({error.status}: {error.message})"
+                ) from error
+            # Very large extractions can be refused by the filtered API; fall back to bulk
+            df = self._fetch_full(dataset_code, country_code, start_year, end_year, dimension_filters)
+
+        if df is None or df.empty:
+            raise NoDataError(f"No data available for {country_code} in the selected year range")
+
+        df = df.rename(columns={'geo': 'Country Code', 'value': 'Value', 'year': 'Year'})
+
+        # Get unit labels from the local metadata index (no extra request)
+        if 'unit' in df.columns:
+            unit_labels = self.metadata_index.labels(dataset_code, 'unit')
+            # Categorical map runs once per distinct unit code, not per row
+            df['Unit'] = df['unit'].astype('category').map(lambda code: unit_labels.get(code, code))
+        else:
+            df['Unit'] = ''
+
+        # Sort by sub-period too so quarterly and monthly series stay in order
+        df = df.sort_values(['Year', 'sub_period'])
+        return df[list(self.columns)].reset_index(drop=True)
+
+    def metadata(self, dataset_code, wait=True):
+        """Returns {dimension: {code: label}} for a dataset from the local index"""
+        return self.metadata_index.dimensions(dataset_code, wait=wait)
@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pandas as pd
+
+from ..aio import fetch_json
+
+# Eurostat dissemination API (JSON-stat 2.0). Point EUROSTAT_API_URL at a mock
+# server to run the explorer offline.
+DEFAULT_API_URL = os.environ.get(
+    "EUROSTAT_API_URL",
+    "https://ec.europa.eu/eurostat/api/dissemination/statistics/1.0/data"
+)
+
+
+def build_query(geo=None, start_year=None, end_year=None, filters=None):
+    """Builds the query parameters that restrict a dataset request to one slice"""
+    params = [("format", "JSON"), ("lang", "EN")]
+    if geo:
+        for code in [geo] if isinstance(geo, str) else geo:
+            params.append(("geo", code))
+    if start_year is not None:
+        params.append(("sinceTimePeriod", str(start_year)))
+    if end_year is not None:
+        params.append(("untilTimePeriod", str(end_year)))
+    # Any other dimension (unit, sex, age, ...) is filtered by repeating its code
+    for dim, codes in (filters or {}).items():
+        for code in [codes] if isinstance(codes, str) else codes:
+            params.append((dim, code))
+    return params
+
+
+def _category_codes(category):
+    # JSON-stat allows the index to be either a list or a {code: position} map
+    index = category.get("index")
+    if index is None:
+        return list(category.get("label", {}).keys())
+    if isinstance(index, list):
+        return index
+    return [code for code, _ in sorted(index.items(), key=lambda item: item[1])]
+
+
+def parse_jsonstat(payload):
+    """Converts a JSON-stat 2.0 dataset into a long frame
+
+    Returns one categorical column per dimension (codes, with 'time' renamed
+    to 'period') plus a float 'value' column. Only observations present in
+    the response are materialised, so sparse datasets stay small.
+    """
+    dims = payload["id"]
+    sizes = payload["size"]
+    values = payload.get("value", {})
+
+    if isinstance(values, dict):
+        positions = np.fromiter((int(k) for k in values.keys()), dtype=np.int64, count=len(values))
+        observed = np.fromiter(
+            (np.nan if v is None else v for v in values.values()),
+            dtype=np.float64, count=len(values)
+        )
+    else:
+        observed = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        positions = np.arange(len(observed), dtype=np.int64)
+        keep = ~np.isnan(observed)
+        positions, observed = positions[keep], observed[keep]
+
+    # Row-major strides turn each flat position back into per-dimension codes
+    strides = np.cumprod([1] + sizes[::-1][:-1])[::-1]
+    columns = {}
+    for dim, size, stride in zip(dims, sizes, strides):
+        codes = _category_codes(payload["dimension"][dim]["category"])
+        columns["period" if dim == "time" else dim] = pd.Categorical.from_codes(
+            (positions // stride) % size, categories=codes
+        )
+    columns["value"] = observed
+
+    return pd.DataFrame(columns)
+
+
+def dimension_labels(payload, dim):
+    """Returns the {code: label} map for one dimension of a JSON-stat response"""
+    return dict(payload["dimension"][dim]["category"].get("label", {}))
+
+
+def fetch_dataset_slice(dataset_code, geo=None, start_year=None, end_year=None, filters=None,
+                        base_url=DEFAULT_API_URL, timeout=60):
+    """Downloads only the requested geo/time/dimension slice of a dataset
+
+    Returns the parsed long frame and the raw JSON-stat payload (for labels).
+    """
+    payload = fetch_json(
+        f"{base_url.rstrip('/')}/{dataset_code}",
+        params=build_query(geo, start_year, end_year, filters),
+        timeout=timeout
+    )
+
+    if "error" in payload:
+        raise ValueError(f"Eurostat API error: {payload['error']}")
+
+    return parse_jsonstat(payload), payload
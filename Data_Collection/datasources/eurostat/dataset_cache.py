@@ -0,0 +1,127 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+import pandas as pd
+import pyarrow.parquet as pq
+
+from ..base import DATA_DIR
+
+# Cache location and limits, overridable for deployments
+DEFAULT_CACHE_DIR = os.environ.get(
+    "EUROSTAT_CACHE_DIR",
+    str(DATA_DIR / "eurostat" / "raw")
+)
+DEFAULT_TTL_SECONDS = int(os.environ.get("EUROSTAT_CACHE_TTL", 24 * 3600))
+DEFAULT_MAX_BYTES = int(os.environ.get("EUROSTAT_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+
+class DatasetCache:
+    """On-disk cache of raw Eurostat datasets, one Parquet file per dataset code
+
+    Entries expire after ttl_seconds and the least recently used ones are
+    evicted once the cache grows beyond max_bytes. Reads are memory-mapped and
+    accept Parquet row filters and column projections, so a country/year view
+    never materialises the whole dataset in memory.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._index_path = self.root / "index.json"
+        self._lock = threading.RLock()
+        self._load_locks = {}
+
+    def _path(self, dataset_code):
+        return self.root / f"{re.sub(r'[^A-Za-z0-9._-]', '_', dataset_code)}.parquet"
+
+    def _load_index(self):
+        if not self._index_path.exists():
+            return {}
+        with open(self._index_path) as f:
+            return json.load(f)
+
+    def _save_index(self, index):
+        tmp = self._index_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path)
+
+    def _drop(self, index, dataset_code):
+        index.pop(dataset_code, None)
+        self._path(dataset_code).unlink(missing_ok=True)
+
+    def contains(self, dataset_code):
+        """Returns True if a fresh copy of the dataset is cached, expiring stale ones"""
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(dataset_code)
+            if entry is None:
+                return False
+            if time.time() - entry["written"] > self.ttl_seconds or not self._path(dataset_code).exists():
+                self._drop(index, dataset_code)
+                self._save_index(index)
+                return False
+            return True
+
+    def put(self, dataset_code, df):
+        """Stores a parsed dataset and evicts least recently used entries over the size limit"""
+        with self._lock:
+            path = self._path(dataset_code)
+            tmp = path.with_suffix(".parquet.tmp")
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+
+            now = time.time()
+            index = self._load_index()
+            index[dataset_code] = {"written": now, "accessed": now, "bytes": path.stat().st_size}
+
+            total = sum(entry["bytes"] for entry in index.values())
+            for code, entry in sorted(index.items(), key=lambda item: item[1]["accessed"]):
+                if total <= self.max_bytes:
+                    break
+                if code == dataset_code:
+                    continue
+                total -= entry["bytes"]
+                self._drop(index, code)
+            self._save_index(index)
+
+    def columns(self, dataset_code):
+        """Returns the column names of a cached dataset without reading its data"""
+        return pq.read_schema(self._path(dataset_code)).names
+
+    def read(self, dataset_code, filters=None, columns=None):
+        """Reads a view of a cached dataset, pushing row filters and columns into Parquet"""
+        with self._lock:
+            index = self._load_index()
+            if dataset_code in index:
+                index[dataset_code]["accessed"] = time.time()
+                self._save_index(index)
+        return pd.read_parquet(
+            self._path(dataset_code),
+            filters=filters,
+            columns=columns,
+            memory_map=True
+        )
+
+    def get_or_load(self, dataset_code, loader):
+        """Ensures the dataset is cached, calling loader() to download it on a miss
+
+        Returns False if the loader produced no data.
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(dataset_code, threading.Lock())
+        # Concurrent sessions asking for the same dataset wait for a single download
+        with load_lock:
+            if self.contains(dataset_code):
+                return True
+            df = loader()
+            if df is None or df.empty:
+                return False
+            self.put(dataset_code, df)
+            return True
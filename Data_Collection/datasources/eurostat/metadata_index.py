@@ -0,0 +1,144 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+import eurostat
+
+from ..base import DATA_DIR
+
+# Index location and refresh interval, overridable for deployments
+DEFAULT_METADATA_DIR = os.environ.get(
+    "EUROSTAT_METADATA_DIR",
+    str(DATA_DIR / "eurostat" / "metadata")
+)
+DEFAULT_METADATA_TTL = int(os.environ.get("EUROSTAT_METADATA_TTL", 7 * 24 * 3600))
+
+# Dimensions that are chosen elsewhere in the UI and never offered as pickers
+FIXED_DIMENSIONS = ("geo", "time", "freq")
+
+
+def load_dimension_labels(dataset_code):
+    """Downloads {dimension: {code: label}} for a dataset via the eurostat package"""
+    dimensions = {}
+    for par in eurostat.get_pars(dataset_code):
+        pairs = eurostat.get_dic(dataset_code, par, full=False) or []
+        dimensions[par] = {str(code): str(label) for code, label in pairs}
+    return dimensions
+
+
+class MetadataIndex:
+    """Persistent per-dataset index of dimension codes and labels
+
+    Entries are kept in memory and as <root>/<dataset>.json. Once older than
+    ttl_seconds they are still served while a background thread rebuilds them,
+    so lookups never wait on the network after the first build.
+
+    Labels merged from data responses form a partial entry: it answers
+    labels() for the codes it has, while dimensions() (which lists every
+    code) still builds the complete entry.
+    """
+
+    def __init__(self, root=DEFAULT_METADATA_DIR, ttl_seconds=DEFAULT_METADATA_TTL,
+                 loader=load_dimension_labels):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.loader = loader
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, dataset_code):
+        return self.root / f"{re.sub(r'[^A-Za-z0-9._-]', '_', dataset_code)}.json"
+
+    def _read_disk(self, dataset_code):
+        path = self._path(dataset_code)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _store(self, dataset_code, entry):
+        path = self._path(dataset_code)
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+        with self._lock:
+            self._entries[dataset_code] = entry
+
+    def _build(self, dataset_code):
+        entry = {"built": time.time(), "complete": True, "dimensions": self.loader(dataset_code)}
+        self._store(dataset_code, entry)
+        return entry
+
+    def _refresh_async(self, dataset_code):
+        with self._lock:
+            if dataset_code in self._refreshing:
+                return
+            self._refreshing.add(dataset_code)
+
+        def refresh():
+            try:
+                self._build(dataset_code)
+            except Exception:
+                # Keep serving the previous entry; the next lookup retries
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(dataset_code)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _entry(self, dataset_code):
+        with self._lock:
+            entry = self._entries.get(dataset_code)
+        if entry is None:
+            entry = self._read_disk(dataset_code)
+            if entry is not None:
+                with self._lock:
+                    self._entries[dataset_code] = entry
+        return entry
+
+    def _lookup(self, dataset_code, wait, partial_ok):
+        entry = self._entry(dataset_code)
+        # Entries written before partial ones existed were always complete
+        usable = entry is not None and (partial_ok or entry.get("complete", True))
+
+        if not usable:
+            if not wait:
+                self._refresh_async(dataset_code)
+                return None
+            entry = self._build(dataset_code)
+        elif time.time() - entry["built"] > self.ttl_seconds:
+            self._refresh_async(dataset_code)
+
+        return entry["dimensions"]
+
+    def dimensions(self, dataset_code, wait=True):
+        """Returns {dimension: {code: label}} for a dataset
+
+        With wait=False a missing entry is built in the background and None is
+        returned instead of blocking on the network.
+        """
+        return self._lookup(dataset_code, wait, partial_ok=False)
+
+    def labels(self, dataset_code, dimension, wait=True):
+        """Returns the {code: label} map of one dimension (empty if unknown)
+
+        A partial entry merged from data responses is enough here, so
+        labelling fetched data never triggers a full metadata download.
+        """
+        return (self._lookup(dataset_code, wait, partial_ok=True) or {}).get(dimension, {})
+
+    def merge(self, dataset_code, dimensions):
+        """Adds labels seen in a data response, e.g. from a JSON-stat payload"""
+        # A new entry is as fresh as the response it came from, but only partial
+        entry = self._entry(dataset_code) or {"built": time.time(), "complete": False, "dimensions": {}}
+        merged = {dim: dict(codes) for dim, codes in entry["dimensions"].items()}
+        for dim, codes in dimensions.items():
+            merged.setdefault(dim, {}).update(codes)
+        self._store(dataset_code, {"built": entry["built"], "complete": entry.get("complete", True),
+                                   "dimensions": merged})
@@ -0,0 +1,130 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Eurostat period codes: 2020, 2020Q1 / 2020-Q1, 2020S1 / 2020-S1, 2020M01 / 2020-01,
+# 2020W01 / 2020-W01 and daily 2020-01-15 / 2020D001
+PERIOD_PATTERN = re.compile(
+    r"^\s*(?P<year>\d{4})(?:-?(?P<freq>[SQMWD])(?P<sub>\d{1,3})|-(?P<month>\d{2})(?:-(?P<day>\d{2}))?)?\s*$"
+)
+
+# Sub-periods per year for each frequency code, for placing periods on a time axis
+PERIODS_PER_YEAR = {"A": 1, "S": 2, "Q": 4, "M": 12, "W": 53, "D": 366}
+
+
+def parse_period(label):
+    """Parses one period code into (year, sub_period, frequency)
+
+    sub_period is 0 for annual data; returns None if the label is not a period.
+    """
+    match = PERIOD_PATTERN.match(str(label))
+    if not match:
+        return None
+    year = int(match.group("year"))
+    if match.group("freq"):
+        return year, int(match.group("sub")), match.group("freq")
+    if match.group("day"):
+        # Day of year keeps daily sub-periods sortable within the year
+        day = pd.Timestamp(year=year, month=int(match.group("month")), day=int(match.group("day")))
+        return year, day.dayofyear, "D"
+    if match.group("month"):
+        return year, int(match.group("month")), "M"
+    return year, 0, "A"
+
+
+def parse_period_labels(labels):
+    """Parses a sequence of period codes once each into a typed frame"""
+    parsed = [parse_period(label) for label in labels]
+    valid = [p is not None for p in parsed]
+    parsed = [p if p is not None else (0, 0, "") for p in parsed]
+    return pd.DataFrame({
+        "period": list(labels),
+        "year": np.array([p[0] for p in parsed], dtype=np.int16),
+        "sub_period": np.array([p[1] for p in parsed], dtype=np.int16),
+        "frequency": [p[2] for p in parsed],
+        "valid": valid,
+    })
+
+
+def select_period_columns(columns, start_year=None, end_year=None):
+    """Splits column names into id columns and in-range period columns
+
+    Works on the header alone, so out-of-range periods can be pruned before
+    any data is read or melted.
+    """
+    periods = parse_period_labels(columns)
+    in_range = periods["valid"].to_numpy().copy()
+    if start_year is not None:
+        in_range &= periods["year"].to_numpy() >= start_year
+    if end_year is not None:
+        in_range &= periods["year"].to_numpy() <= end_year
+    id_vars = [col for col, valid in zip(columns, periods["valid"]) if not valid]
+    period_cols = [col for col, keep in zip(columns, in_range) if keep]
+    return id_vars, period_cols
+
+
+def add_period_columns(df, period_col="period"):
+    """Adds year, sub_period and frequency columns to a long frame
+
+    The period column is parsed once per distinct value (via its categories)
+    rather than once per row.
+    """
+    periods = df[period_col].astype("category")
+    parsed = parse_period_labels(periods.cat.categories)
+    codes = periods.cat.codes.to_numpy()
+    df = df.assign(**{period_col: periods})
+    df["year"] = parsed["year"].to_numpy()[codes]
+    df["sub_period"] = parsed["sub_period"].to_numpy()[codes]
+    frequency = pd.Categorical(parsed["frequency"])
+    df["frequency"] = pd.Categorical.from_codes(frequency.codes[codes], categories=frequency.categories)
+    return df
+
+
+def fractional_year(periods):
+    """Position of each period label on a continuous year axis (2020-Q3 -> 2020.5)"""
+    periods = pd.Series(periods).astype("category")
+    parsed = parse_period_labels(periods.cat.categories)
+    per_year = parsed["frequency"].map(PERIODS_PER_YEAR).fillna(1).to_numpy()
+    # Annual periods have sub_period 0, the others count from 1
+    offset = np.maximum(parsed["sub_period"].to_numpy() - 1, 0) / per_year
+    return (parsed["year"].to_numpy() + offset)[periods.cat.codes.to_numpy()]
+
+
+def reshape_wide(df, start_year=None, end_year=None, value_dtype=np.float64, dropna=True):
+    """Melts a wide Eurostat table (one column per period) into a compact long frame
+
+    Period headers are parsed once, out-of-range period columns are dropped
+    before melting, dimension columns become categoricals and values are
+    stored as value_dtype. The result has the dimension columns followed by
+    period, year, sub_period, frequency and value, sorted by period.
+    """
+    id_vars, period_cols = select_period_columns(list(df.columns), start_year, end_year)
+    periods = parse_period_labels(period_cols)
+
+    # Order periods chronologically so the output needs no row sort
+    order = np.lexsort((periods["sub_period"].to_numpy(), periods["year"].to_numpy()))
+    period_cols = [period_cols[i] for i in order]
+    periods = periods.iloc[order].reset_index(drop=True)
+
+    n_rows, n_periods = len(df), len(period_cols)
+    values = df[period_cols].to_numpy(dtype=value_dtype, na_value=np.nan).T.ravel()
+    period_idx = np.repeat(np.arange(n_periods), n_rows)
+    row_idx = np.tile(np.arange(n_rows), n_periods)
+
+    if dropna:
+        keep = ~np.isnan(values)
+        values, period_idx, row_idx = values[keep], period_idx[keep], row_idx[keep]
+
+    columns = {}
+    for col in id_vars:
+        dim = pd.Categorical(df[col])
+        columns[col] = pd.Categorical.from_codes(dim.codes[row_idx], categories=dim.categories)
+
+    frequency = pd.Categorical(periods["frequency"])
+    columns["period"] = pd.Categorical.from_codes(period_idx, categories=period_cols, ordered=True)
+    columns["year"] = periods["year"].to_numpy()[period_idx]
+    columns["sub_period"] = periods["sub_period"].to_numpy()[period_idx]
+    columns["frequency"] = pd.Categorical.from_codes(frequency.codes[period_idx], categories=frequency.categories)
+    columns["value"] = values
+
+    return pd.DataFrame(columns)
@@ -0,0 +1,132 @@
+"""File exports for fetched frames, shared by the explorers and the batch CLI
+
+Parquet and Feather are written from one Arrow table built from the frame.
+CSV is written in row chunks with DataFrame.to_csv (the format the
+explorers always produced) and streamed through the compressor for the gzip
+and zstd variants, so peak memory is one chunk rather than the whole CSV text.
+"""
+import gzip
+import tempfile
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# format -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("CSV", "csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", "csv.gz", "application/gzip"),
+    "csv.zst": ("CSV (zstd)", "csv.zst", "application/zstd"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "feather": ("Feather / Arrow IPC", "feather", "application/vnd.apache.arrow.file"),
+}
+
+# Rows converted and written per CSV chunk
+CSV_CHUNK_ROWS = 100_000
+
+# Spooled exports stay in memory up to this size, then move to a temp file
+SPOOL_MAX_MEMORY = 64 << 20
+
+# Arrow's gzip codec always uses a slow high level; level 1 is ~7x faster for ~8% more bytes
+GZIP_LEVEL = 1
+
+
+class _KeepOpen:
+    """Write-only proxy whose close() leaves the wrapped Python stream open"""
+
+    closed = False
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        # Arrow closes the stream it compresses into; the caller still owns this one
+        self.flush()
+
+
+def _check_format(fmt):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Available: {', '.join(EXPORT_FORMATS)}")
+
+
+def to_arrow(df):
+    """Arrow table for a frame; numeric columns are converted without a per-value copy"""
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _csv_chunk(chunk, header):
+    # One writer for every chunk, so quoting, booleans and ISO timestamps match throughout
+    return chunk.to_csv(index=False, header=header).encode()
+
+
+def iter_csv_chunks(df, chunk_rows=CSV_CHUNK_ROWS):
+    """Yields df as CSV bytes, header first, converting chunk_rows rows at a time"""
+    yield _csv_chunk(df.iloc[:chunk_rows], header=True)
+    for start in range(chunk_rows, len(df), chunk_rows):
+        yield _csv_chunk(df.iloc[start:start + chunk_rows], header=False)
+
+
+def _write_csv(df, stream):
+    for chunk in iter_csv_chunks(df):
+        stream.write(chunk)
+
+
+def write_export(df, sink, fmt):
+    """Writes df to a path or writable binary stream in one of EXPORT_FORMATS
+
+    An Arrow stream passed as sink is closed afterwards.
+    """
+    _check_format(fmt)
+    if fmt == "parquet":
+        pq.write_table(to_arrow(df), sink)
+    elif fmt == "feather":
+        feather.write_feather(to_arrow(df), sink)
+    elif fmt == "csv.gz":
+        # gzip.open takes a path or an open binary stream
+        with gzip.open(sink, "wb", compresslevel=GZIP_LEVEL) as stream:
+            _write_csv(df, stream)
+    elif fmt == "csv.zst":
+        if not isinstance(sink, (str, pa.NativeFile)):
+            sink = _KeepOpen(sink)
+        with pa.CompressedOutputStream(sink, "zstd") as stream:
+            _write_csv(df, stream)
+    elif isinstance(sink, str):
+        with open(sink, "wb") as stream:
+            _write_csv(df, stream)
+    else:
+        _write_csv(df, sink)
+
+
+def spool_export(df, fmt, max_memory=SPOOL_MAX_MEMORY):
+    """Writes df to a spooled temp file and returns it rewound for reading
+
+    Small exports stay in memory; large ones go to disk while they are
+    written, so the output never sits in a growing in-memory buffer.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        write_export(df, spool, fmt)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def export_bytes(df, fmt):
+    """Returns df serialised in one of EXPORT_FORMATS"""
+    sink = pa.BufferOutputStream()
+    write_export(df, sink, fmt)
+    return sink.getvalue().to_pybytes()
+
+
+def export_file_name(base_name, fmt):
+    """base_name with the extension of an export format"""
+    _check_format(fmt)
+    return f"{base_name}.{EXPORT_FORMATS[fmt][1]}"
@@ -0,0 +1,68 @@
+from ..base import DataSource, NoDataError
+from .bulk import ensure_ingested, read_store
+from .synthetic import COLUMNS, METRIC_DOMAINS, METRIC_UNITS, generate_faostat_cube
+
+
+class FaostatSource(DataSource):
+    """FAOSTAT bulk downloads, ingested once into the local partitioned Parquet store"""
+
+    name = "faostat"
+
+    columns = {
+        'Year': 'Year of the data record',
+        'Element': 'The measured element (production, area harvested, yield, ...)',
+        'Value': 'The quantitative value for the selected item',
+        'Unit': 'Measurement unit (tonnes, hectares, etc.)',
+        'Item Code': 'FAOSTAT item code',
+        'Area Code': 'FAOSTAT area code',
+        'Flag': 'FAOSTAT observation flag'
+    }
+
+    def _fetch(self, domain_code, item_code, area_code, start_year, end_year,
+               ingest_item_codes=None, ingest_area_codes=None):
+        # Stream the domain's bulk file into the local store once, optionally keeping
+        # only the commodities and countries a caller offers; later queries read Parquet only
+        # The queried item and area are always part of the filters, so they are never missing
+        ensure_ingested(
+            domain_code,
+            item_codes=[int(code) for code in ingest_item_codes] + [int(item_code)] if ingest_item_codes else None,
+            area_codes=[int(code) for code in ingest_area_codes] + [int(area_code)] if ingest_area_codes else None
+        )
+
+        df = read_store(
+            domain_code,
+            item_code=item_code,
+            area_code=area_code,
+            start_year=start_year,
+            end_year=end_year
+        )
+
+        if df.empty:
+            raise NoDataError(f"No data available for item {item_code} and area {area_code} in domain {domain_code}.")
+
+        df = df.rename(columns={
+            'year': 'Year',
+            'element': 'Element',
+            'value': 'Value',
+            'unit': 'Unit',
+            'item_code': 'Item Code',
+            'area_code': 'Area Code',
+            'flag': 'Flag'
+        })
+        df['Item Code'] = df['Item Code'].astype('int32')
+        return df.sort_values(['Element', 'Year'])[list(self.columns)].reset_index(drop=True)
+
+
+class SimulatedFaostatSource(DataSource):
+    """Simulated FAOSTAT series from the vectorised cube generator"""
+
+    name = "faostat_simulated"
+
+    columns = dict.fromkeys(COLUMNS, '')
+
+    def _fetch(self, metrics, items, countries, start_year, end_year):
+        # items and countries map display names to FAOSTAT codes
+        return generate_faostat_cube(list(metrics), dict(items), dict(countries), start_year, end_year)
+
+    def metadata(self, metric):
+        return {"unit": METRIC_UNITS.get(metric, "units"), "domain": METRIC_DOMAINS.get(metric, "")}
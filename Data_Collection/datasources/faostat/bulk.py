@@ -0,0 +1,282 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ..base import DATA_DIR
+from ..aio import download
+
+# FAOSTAT bulk download location, overridable to point at a local mirror or test server
+DEFAULT_BULK_URL = os.environ.get("FAOSTAT_BULK_URL", "https://bulks-faostat.fao.org/production/")
+
+# Local partitioned Parquet store
+DEFAULT_STORE_DIR = os.environ.get(
+    "FAOSTAT_STORE_DIR",
+    str(DATA_DIR / "faostat")
+)
+
+# Normalized ("long") bulk file for each domain code
+BULK_FILES = {
+    "QCL": "Production_Crops_Livestock_E_All_Data_(Normalized).zip",
+    "TCL": "Trade_CropsLivestock_E_All_Data_(Normalized).zip",
+    "FS": "Food_Security_Data_E_All_Data_(Normalized).zip",
+    "PP": "Prices_E_All_Data_(Normalized).zip",
+    "GT": "Emissions_Totals_E_All_Data_(Normalized).zip",
+    "FO": "Forestry_E_All_Data_(Normalized).zip",
+    "RL": "Inputs_LandUse_E_All_Data_(Normalized).zip",
+    "MK": "Macro-Statistics_Key_Indicators_E_All_Data_(Normalized).zip",
+}
+
+# Re-download a domain once its local copy is older than this
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+
+# Rows parsed per CSV chunk; bounds peak memory regardless of file size
+DEFAULT_CHUNK_ROWS = 500000
+
+# Fixed output schema so every chunk appends to the same Parquet files
+SCHEMA = pa.schema([
+    ("area_code", pa.int32()),
+    ("area", pa.string()),
+    ("item_code", pa.int32()),
+    ("item", pa.string()),
+    ("element_code", pa.int32()),
+    ("element", pa.string()),
+    ("year", pa.int16()),
+    ("unit", pa.string()),
+    ("value", pa.float64()),
+    ("flag", pa.string()),
+])
+
+# Bulk CSV header -> store column
+CSV_COLUMNS = {
+    "Area Code": "area_code",
+    "Area": "area",
+    "Item Code": "item_code",
+    "Item": "item",
+    "Element Code": "element_code",
+    "Element": "element",
+    "Year": "year",
+    "Unit": "unit",
+    "Value": "value",
+    "Flag": "flag",
+}
+
+
+_ingest_locks = {}
+_ingest_locks_guard = threading.Lock()
+
+
+def download_to_file(url, target, chunk_bytes=1 << 20, timeout=None):
+    """Streams a remote file to disk in fixed-size chunks"""
+    # Bulk zips run to hundreds of MB, so by default only stalls are bounded, not the total
+    download(url, target, chunk_bytes=chunk_bytes, timeout=timeout)
+
+
+def _csv_member(archive):
+    # Bulk zips also ship flag and symbol lookup tables; the data file is the largest CSV
+    members = [m for m in archive.infolist() if m.filename.lower().endswith(".csv")]
+    if not members:
+        raise ValueError("Bulk archive contains no CSV file")
+    return max(members, key=lambda m: m.file_size).filename
+
+
+def iter_bulk_chunks(zip_path, item_codes=None, area_codes=None, start_year=None, end_year=None,
+                     chunk_rows=DEFAULT_CHUNK_ROWS, encoding="utf-8"):
+    """Yields filtered, typed frames from the CSV inside a FAOSTAT bulk zip
+
+    The CSV is decompressed and parsed chunk by chunk straight from the
+    archive, so only chunk_rows rows are ever held in memory.
+    """
+    item_codes = None if item_codes is None else np.asarray(list(item_codes), dtype=np.int64)
+    area_codes = None if area_codes is None else np.asarray(list(area_codes), dtype=np.int64)
+
+    with zipfile.ZipFile(zip_path) as archive, archive.open(_csv_member(archive)) as raw:
+        reader = pd.read_csv(
+            raw,
+            usecols=lambda col: col in CSV_COLUMNS,
+            dtype={"Area": "string", "Item": "string", "Element": "string",
+                   "Unit": "string", "Flag": "string", "Year": "string"},
+            encoding=encoding,
+            encoding_errors="replace",
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            chunk = chunk.rename(columns=CSV_COLUMNS)
+            # Multi-year periods such as "2000-2002" are keyed by their first year
+            chunk["year"] = pd.to_numeric(chunk["year"].str[:4], errors="coerce")
+
+            mask = chunk["year"].notna().to_numpy()
+            if item_codes is not None:
+                mask = mask & np.isin(chunk["item_code"].to_numpy(), item_codes)
+            if area_codes is not None:
+                mask = mask & np.isin(chunk["area_code"].to_numpy(), area_codes)
+            if start_year is not None:
+                mask = mask & (chunk["year"] >= start_year).to_numpy()
+            if end_year is not None:
+                mask = mask & (chunk["year"] <= end_year).to_numpy()
+
+            chunk = chunk[mask]
+            if chunk.empty:
+                continue
+            chunk = chunk.assign(year=chunk["year"].astype(np.int16))
+            for col in SCHEMA.names:
+                if col not in chunk.columns:
+                    chunk[col] = None
+            yield chunk[SCHEMA.names]
+
+
+def ingest_bulk_file(domain_code, store_dir=DEFAULT_STORE_DIR, source=None, item_codes=None,
+                     area_codes=None, start_year=None, end_year=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Streams one FAOSTAT bulk file into <store_dir>/<domain_code>/item_code=<code>/
+
+    source may be a URL or a local zip path; by default it is the domain's
+    file under DEFAULT_BULK_URL. Rows are filtered by item, area and year while
+    parsing and written to one Parquet file per item code. The new partitions
+    replace the previous ones atomically. Returns the number of rows stored.
+    """
+    if source is None:
+        if domain_code not in BULK_FILES:
+            raise ValueError(f"No bulk file configured for domain {domain_code}")
+        source = DEFAULT_BULK_URL.rstrip("/") + "/" + BULK_FILES[domain_code]
+
+    domain_dir = Path(store_dir) / domain_code
+    staging_dir = Path(store_dir) / f".{domain_code}.staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+
+    writers = {}
+    rows = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        if str(source).startswith(("http://", "https://")):
+            zip_path = Path(tmp) / "bulk.zip"
+            download_to_file(source, zip_path)
+        else:
+            zip_path = Path(source)
+
+        try:
+            for chunk in iter_bulk_chunks(zip_path, item_codes, area_codes, start_year, end_year, chunk_rows):
+                for item_code, part in chunk.groupby("item_code", sort=False):
+                    writer = writers.get(item_code)
+                    if writer is None:
+                        part_dir = staging_dir / f"item_code={item_code}"
+                        part_dir.mkdir()
+                        writer = pq.ParquetWriter(part_dir / "part-0.parquet", SCHEMA.remove(SCHEMA.get_field_index("item_code")))
+                        writers[item_code] = writer
+                    writer.write_table(pa.Table.from_pandas(
+                        part.drop(columns="item_code"), schema=writer.schema, preserve_index=False
+                    ))
+                    rows += len(part)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+    with open(staging_dir / "_manifest.json", "w") as f:
+        json.dump({
+            "source": str(source),
+            "ingested": time.time(),
+            "rows": rows,
+            "item_codes": None if item_codes is None else sorted(int(c) for c in item_codes),
+            "area_codes": None if area_codes is None else sorted(int(c) for c in area_codes),
+            "start_year": start_year,
+            "end_year": end_year,
+        }, f)
+
+    shutil.rmtree(domain_dir, ignore_errors=True)
+    os.replace(staging_dir, domain_dir)
+    return rows
+
+
+def read_manifest(domain_code, store_dir=DEFAULT_STORE_DIR):
+    """Returns the ingestion manifest of a domain, or None if it was never ingested"""
+    path = Path(store_dir) / domain_code / "_manifest.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _codes_covered(stored, requested):
+    # None means "every code"
+    return stored is None or (requested is not None and set(int(c) for c in requested) <= set(stored))
+
+
+def _years_covered(manifest, start_year, end_year):
+    stored_start, stored_end = manifest.get("start_year"), manifest.get("end_year")
+    return ((stored_start is None or (start_year is not None and start_year >= stored_start))
+            and (stored_end is None or (end_year is not None and end_year <= stored_end)))
+
+
+def _widen(manifest, item_codes=None, area_codes=None, start_year=None, end_year=None, **ingest_kwargs):
+    # Filters covering both the stored copy and the request, so other callers' rows are kept
+    def union(stored, requested):
+        if stored is None or requested is None:
+            return None
+        return sorted(set(stored) | set(int(c) for c in requested))
+
+    def bound(stored, requested, pick):
+        return None if stored is None or requested is None else pick(stored, requested)
+
+    return dict(
+        ingest_kwargs,
+        item_codes=union(manifest.get("item_codes"), item_codes),
+        area_codes=union(manifest.get("area_codes"), area_codes),
+        start_year=bound(manifest.get("start_year"), start_year, min),
+        end_year=bound(manifest.get("end_year"), end_year, max),
+    )
+
+
+def ensure_ingested(domain_code, store_dir=DEFAULT_STORE_DIR, max_age_seconds=DEFAULT_MAX_AGE_SECONDS,
+                    **ingest_kwargs):
+    """Ingests a domain unless a fresh local copy covering the request exists
+
+    A stored copy filtered to other items, areas or years is re-ingested
+    with the union of its filters and the requested ones. Concurrent
+    callers share one run.
+    """
+    with _ingest_locks_guard:
+        lock = _ingest_locks.setdefault((str(store_dir), domain_code), threading.Lock())
+    with lock:
+        manifest = read_manifest(domain_code, store_dir)
+        if manifest is None:
+            return ingest_bulk_file(domain_code, store_dir=store_dir, **ingest_kwargs)
+        covered = (_codes_covered(manifest.get("item_codes"), ingest_kwargs.get("item_codes"))
+                   and _codes_covered(manifest.get("area_codes"), ingest_kwargs.get("area_codes"))
+                   and _years_covered(manifest, ingest_kwargs.get("start_year"), ingest_kwargs.get("end_year")))
+        if covered and time.time() - manifest["ingested"] <= max_age_seconds:
+            return manifest["rows"]
+        return ingest_bulk_file(domain_code, store_dir=store_dir, **_widen(manifest, **ingest_kwargs))
+
+
+def read_store(domain_code, item_code=None, area_code=None, start_year=None, end_year=None,
+               store_dir=DEFAULT_STORE_DIR):
+    """Reads a slice of an ingested domain, pruning partitions and row groups
+
+    A domain whose ingest kept no rows has no partitions; it reads as an
+    empty frame with the store's columns.
+    """
+    domain_dir = Path(store_dir) / domain_code
+    if not any(domain_dir.glob("item_code=*")):
+        return SCHEMA.empty_table().to_pandas()
+
+    filters = []
+    if item_code is not None:
+        filters.append(("item_code", "=", int(item_code)))
+    if area_code is not None:
+        filters.append(("area_code", "=", int(area_code)))
+    if start_year is not None:
+        filters.append(("year", ">=", int(start_year)))
+    if end_year is not None:
+        filters.append(("year", "<=", int(end_year)))
+    return pd.read_parquet(
+        domain_dir,
+        filters=filters or None,
+        partitioning="hive",
+    )
@@ -0,0 +1,125 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+# Typical magnitude of each metric, used as the series level in the first year
+METRIC_BASE_VALUES = {
+    "Production": 1000000,
+    "Yield": 30,
+    "Area Harvested": 50000,
+    "Import Quantity": 500000,
+    "Export Quantity": 300000,
+    "Value": 250000000,
+    "Food Supply": 2500,
+    "Dietary Energy Supply": 3000,
+    "Producer Price": 150,
+    "Consumer Price": 200,
+    "Emissions": 50000,
+    "Carbon Stock": 1000000
+}
+
+METRIC_UNITS = {
+    "Production": "tonnes",
+    "Yield": "hg/ha",
+    "Area Harvested": "ha",
+    "Import Quantity": "tonnes",
+    "Export Quantity": "tonnes",
+    "Value": "1000 US$",
+    "Food Supply": "kcal/capita/day",
+    "Dietary Energy Supply": "kcal/capita/day",
+    "Producer Price": "US$/tonne",
+    "Consumer Price": "US$/tonne",
+    "Emissions": "kt CO2eq",
+    "Carbon Stock": "kt C"
+}
+
+# Domain each metric belongs to (mirrors the explorer's catalogue)
+METRIC_DOMAINS = {
+    "Production": "Production", "Yield": "Production", "Area Harvested": "Production",
+    "Import Quantity": "Trade", "Export Quantity": "Trade", "Value": "Trade",
+    "Food Supply": "Food Security", "Dietary Energy Supply": "Food Security",
+    "Producer Price": "Prices", "Consumer Price": "Prices",
+    "Emissions": "Emissions", "Carbon Stock": "Emissions"
+}
+
+# Bulk benchmarking presets: (items, countries, first year, last year) for all 12 metrics
+SCENARIOS = {
+    "small": (8, 10, 2000, 2023),
+    "1m": (40, 50, 1981, 2022),
+    "10m": (200, 70, 1964, 2023),
+    "50m": (400, 200, 1966, 2017),
+}
+
+COLUMNS = ["Year", "Value", "Unit", "Flag", "Country", "Item", "Domain", "Metric"]
+
+
+def generate_faostat_cube(metrics, items, countries, start_year, end_year,
+                          trend=0.02, noise=0.0, seed=None):
+    """Generates a metric x item x country x year cube of simulated FAOSTAT data
+
+    metrics is a list of metric names (their domain comes from METRIC_DOMAINS),
+    items and countries map names to FAOSTAT codes. Values follow a linear
+    trend from each metric's base level, scaled by the item code; noise adds
+    seeded Gaussian relative noise. All label columns are categoricals, so
+    tens of millions of rows fit comfortably in memory.
+    """
+    metrics = list(metrics)
+    item_names, item_codes = list(items.keys()), np.array(list(items.values()), dtype=np.int64)
+    country_names = list(countries.keys())
+    years = np.arange(start_year, end_year + 1, dtype=np.int16)
+    n_metrics, n_items, n_countries, n_years = len(metrics), len(item_names), len(country_names), len(years)
+    n_rows = n_metrics * n_items * n_countries * n_years
+
+    # Flat row -> per-dimension position, laid out metric-major and year-minor
+    metric_idx = np.repeat(np.arange(n_metrics, dtype=np.int32), n_items * n_countries * n_years)
+    item_idx = np.tile(np.repeat(np.arange(n_items, dtype=np.int32), n_countries * n_years), n_metrics)
+    country_idx = np.tile(np.repeat(np.arange(n_countries, dtype=np.int32), n_years), n_metrics * n_items)
+    year = np.tile(years, n_metrics * n_items * n_countries)
+
+    base = np.array([METRIC_BASE_VALUES.get(m, 1000) for m in metrics], dtype=np.float64)
+    item_factor = 0.95 + 0.1 * (item_codes % 10) / 10
+    values = base[metric_idx] * (1 + trend * (year - start_year)) * item_factor[item_idx]
+    if noise:
+        rng = np.random.default_rng(seed)
+        values *= 1 + noise * rng.standard_normal(n_rows, dtype=np.float32)
+
+    units = pd.Categorical([METRIC_UNITS.get(m, "units") for m in metrics])
+    domains = pd.Categorical([METRIC_DOMAINS.get(m, "") for m in metrics])
+
+    return pd.DataFrame({
+        "Year": year,
+        "Value": values.astype(np.int64),
+        "Unit": pd.Categorical.from_codes(units.codes[metric_idx], categories=units.categories),
+        "Flag": pd.Categorical.from_codes((year % 2).astype(np.int8), categories=["Official", "Estimated"]),
+        "Country": pd.Categorical.from_codes(country_idx, categories=country_names),
+        "Item": pd.Categorical.from_codes(item_idx, categories=item_names),
+        "Domain": pd.Categorical.from_codes(domains.codes[metric_idx], categories=domains.categories),
+        "Metric": pd.Categorical.from_codes(metric_idx, categories=metrics),
+    }, columns=COLUMNS)
+
+
+def generate_scenario(name, noise=0.05, seed=42):
+    """Generates one of the SCENARIOS presets with synthetic item and country codes"""
+    n_items, n_countries, start_year, end_year = SCENARIOS[name]
+    items = {f"Item {code}": code for code in range(1, n_items + 1)}
+    countries = {f"Country {code}": code for code in range(1, n_countries + 1)}
+    return generate_faostat_cube(
+        list(METRIC_BASE_VALUES), items, countries, start_year, end_year, noise=noise, seed=seed
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a simulated FAOSTAT cube for load testing")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="1m")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="optional Parquet output path")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cube = generate_scenario(args.scenario, seed=args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"{len(cube):,} rows in {elapsed:.2f}s "
+          f"({len(cube) / elapsed:,.0f} rows/s, {cube.memory_usage(deep=True).sum() / 1e6:,.0f} MB)")
+    if args.out:
+        cube.to_parquet(args.out, index=False)
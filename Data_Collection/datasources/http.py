@@ -0,0 +1,50 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connections kept open per host; sized for the batch worker pools
+POOL_SIZE = 32
+
+# Retry/backoff policy shared by the requests session and the async client
+RETRY_TOTAL = 5
+BACKOFF_FACTOR = 0.5
+BACKOFF_MAX = 120
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def retry_policy():
+    """Retry/backoff policy shared by every data source"""
+    return Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=list(RETRY_STATUSES),
+    )
+
+
+# Create a custom session with retries
+def create_session(pool_size=POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=retry_policy(), pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+def get_session():
+    """Returns the process-wide pooled session, so TCP/TLS connections are reused
+
+    Only clients that bring their own blocking transport (yfinance) still need
+    it; plain HTTP calls go through datasources.aio. Callers must not close it.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
@@ -0,0 +1,65 @@
+import time
+
+from ..base import DataSource
+from ..http import get_session
+from .history import DEFAULT_MAX_WORKERS, fetch_stock_batch
+from .intraday import INTRADAY_LIMITS, IntradayStore
+from .store import OHLCVStore
+
+# Intervals offered by the explorer, daily first
+INTERVALS = ["1d"] + list(INTRADAY_LIMITS)
+
+
+class StockSource(DataSource):
+    """Daily and intraday OHLCV bars from Yahoo Finance, served through the local stores"""
+
+    name = "stocks"
+
+    columns = {
+        'date': 'Date of the trading day',
+        'open': 'The price at market open',
+        'high': 'The highest price for that day',
+        'low': 'The lowest price for that day',
+        'close': 'The price at market close, adjusted for splits',
+        'adj_close': 'Closing price adjusted for splits and dividend distributions (CRSP standards)',
+        'volume': 'The number of shares traded on that day'
+    }
+
+    def __init__(self, store=None, intraday_store=None, **kwargs):
+        # The stores are the cache, and they know today's bar is still forming;
+        # the shared result cache would freeze a range ending today for a whole day
+        kwargs.setdefault("cache", None)
+        super().__init__(**kwargs)
+        self.store = store or OHLCVStore()
+        self.intraday_store = intraday_store or IntradayStore()
+
+    def _downloader(self, interval):
+        # (ticker, start, end, session) callable for the interval's store
+        if interval == "1d":
+            return self.store.fetch
+        return lambda ticker, start, end, session=None: self.intraday_store.fetch(
+            ticker, start, end, interval, session=session)
+
+    def _fetch(self, ticker, start_date, end_date, interval="1d"):
+        # Only missing date ranges (or days) are downloaded; the rest is read from Parquet
+        return self._downloader(interval)(ticker, start_date, end_date, session=get_session())
+
+    def fetch_batch(self, tickers, start_date, end_date, interval="1d", max_workers=DEFAULT_MAX_WORKERS):
+        """Fetches several tickers concurrently; returns (long frame, errors by ticker)"""
+        started = time.perf_counter()
+        data, errors = fetch_stock_batch(
+            tickers, start_date, end_date,
+            max_workers=max_workers,
+            downloader=self._downloader(interval)
+        )
+        self.instrumentation.record(self.name, time.perf_counter() - started, len(data))
+        return data, errors
+
+    def metadata(self, ticker):
+        return {"ticker": ticker, "coverage": self.store.coverage(ticker)}
+
+    def schema(self, interval="1d"):
+        columns = dict(self.columns)
+        if interval != "1d":
+            columns = {'datetime': 'Start of the bar (UTC)', **{k: v for k, v in columns.items() if k != 'date'}}
+        return {'ticker': 'Ticker symbol (batch mode only)', **columns}
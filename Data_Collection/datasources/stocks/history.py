@@ -0,0 +1,149 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import backoff
+import pandas as pd
+import yfinance as yf
+
+from ..base import NoDataError, SingleFlight
+from ..http import get_session
+from .limiter import YAHOO_LIMITER
+
+# Columns returned for every ticker, in display order
+OHLCV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'adj_close', 'volume']
+
+# Default number of concurrent ticker downloads in batch mode
+DEFAULT_MAX_WORKERS = 8
+
+# Attempts per download when Yahoo throttles, with jittered exponential waits
+MAX_THROTTLE_TRIES = 5
+
+# yfinance exceptions that mean "nothing to return" rather than a failure
+_MISSING_DATA_ERRORS = tuple(
+    getattr(yf.exceptions, name) for name in ("YFPricesMissingError", "YFTzMissingError", "YFTickerMissingError")
+    if hasattr(yf.exceptions, name)
+)
+
+# Concurrent identical downloads (same ticker, range and interval) share one request
+_downloads = SingleFlight()
+
+
+class ThrottledError(IOError):
+    """Raised when Yahoo answers with a rate-limit response"""
+
+
+def _is_throttled(error):
+    if type(error).__name__ == "YFRateLimitError":
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "too many requests" in message or "rate limit" in message
+
+
+def normalize_history(data, columns=OHLCV_COLUMNS):
+    """Converts a yfinance history frame to the date/OHLCV column layout"""
+    # Rename columns to match requirements
+    data = data.rename(columns={
+        'Open': 'open',
+        'High': 'high',
+        'Low': 'low',
+        'Close': 'close',
+        'Adj Close': 'adj_close',
+        'Volume': 'volume'
+    })
+
+    # Ensure all required columns are present
+    missing = [col for col in columns[1:] if col not in data.columns]
+    if missing:
+        raise ValueError(f"Retrieved data is missing required columns: {', '.join(missing)}")
+
+    # Reset index to make date a column and rename it
+    data = data.reset_index()
+    data = data.rename(columns={'Date': columns[0], 'Datetime': columns[0]})
+
+    # Select and reorder columns
+    return data[columns]
+
+
+@backoff.on_exception(backoff.expo, ThrottledError, max_tries=MAX_THROTTLE_TRIES, jitter=backoff.full_jitter)
+def _request_history(ticker, start_date, end_date, interval, session):
+    # Paced by the shared adaptive limiter; throttling slows every caller down
+    YAHOO_LIMITER.acquire()
+    try:
+        # Fetch data with adjusted close
+        data = yf.Ticker(ticker, session=session).history(
+            start=start_date,
+            end=end_date,
+            interval=interval,
+            auto_adjust=False,  # Set to False to get both adjusted and unadjusted prices
+            actions=True,
+            raise_errors=True  # Surface throttling instead of an empty frame
+        )
+    except _MISSING_DATA_ERRORS:
+        YAHOO_LIMITER.succeeded()
+        return None
+    except Exception as e:
+        if _is_throttled(e):
+            YAHOO_LIMITER.throttled()
+            raise ThrottledError(f"Yahoo Finance rate limit hit for {ticker}") from e
+        raise
+    YAHOO_LIMITER.succeeded()
+    return data
+
+
+def download_bars(ticker, start_date, end_date, interval="1d", session=None):
+    """Returns the raw yfinance frame for one request, or None when Yahoo has no bars"""
+    key = (ticker, str(start_date), str(end_date), interval)
+    data, _ = _downloads.do(key, lambda: _request_history(ticker, start_date, end_date, interval, session))
+    return data
+
+
+def download_history(ticker, start_date, end_date, session=None):
+    """Downloads daily bars for one ticker, raising on empty or malformed results"""
+    data = download_bars(ticker, start_date, end_date, "1d", session)
+
+    if data is None or data.empty:
+        raise NoDataError(f"No data available for {ticker} in the specified date range.")
+
+    return normalize_history(data)
+
+
+def fetch_stock_batch(tickers, start_date, end_date, max_workers=DEFAULT_MAX_WORKERS,
+                      downloader=download_history):
+    """Fetches several tickers concurrently over the shared pooled session
+
+    Returns a long-format frame with a leading 'ticker' column and a dict
+    mapping each failed ticker to its error message.
+    """
+    # Drop blanks and duplicates while keeping the caller's order
+    tickers = list(dict.fromkeys(t.strip() for t in tickers if t and t.strip()))
+    frames = {}
+    errors = {}
+
+    if not tickers:
+        return pd.DataFrame(columns=['ticker'] + OHLCV_COLUMNS), errors
+
+    workers = max(1, min(max_workers, len(tickers)))
+    session = get_session()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(downloader, ticker, start_date, end_date, session): ticker
+            for ticker in tickers
+        }
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                frames[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = str(e)
+
+    if not frames:
+        return pd.DataFrame(columns=['ticker'] + OHLCV_COLUMNS), errors
+
+    # Concatenate in request order so the output is deterministic
+    columns = ['ticker'] + list(next(iter(frames.values())).columns)
+    data = pd.concat(
+        [frames[t].assign(ticker=t) for t in tickers if t in frames],
+        ignore_index=True
+    )
+    return data[columns], errors
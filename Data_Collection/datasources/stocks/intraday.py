@@ -0,0 +1,215 @@
+import datetime as dt
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pandas as pd
+
+from ..base import DATA_DIR, NoDataError
+from .history import OHLCV_COLUMNS, download_bars, normalize_history
+
+# Columns returned for intraday bars; timestamps are tz-aware UTC
+INTRADAY_COLUMNS = ['datetime'] + OHLCV_COLUMNS[1:]
+
+# interval -> (longest range per request, how far back Yahoo serves it), in days
+INTRADAY_LIMITS = {
+    "1m": (7, 30),
+    "2m": (60, 60),
+    "5m": (60, 60),
+    "15m": (60, 60),
+    "30m": (60, 60),
+    "90m": (60, 60),
+    "60m": (730, 730),
+    "1h": (730, 730),
+}
+
+# Default number of windows downloaded at once for one ticker
+DEFAULT_WINDOW_WORKERS = 4
+
+# Default location of the day-partitioned intraday store
+DEFAULT_INTRADAY_DIR = os.environ.get(
+    "STOCK_INTRADAY_DIR",
+    str(DATA_DIR / "stocks" / "intraday")
+)
+
+
+def _to_date(value):
+    return pd.Timestamp(value).date()
+
+
+def _check_interval(interval):
+    if interval not in INTRADAY_LIMITS:
+        raise ValueError(f"Unsupported intraday interval '{interval}'. Available: {', '.join(INTRADAY_LIMITS)}")
+
+
+def split_range(start_date, end_date, interval, today=None):
+    """Splits [start_date, end_date) into the windows Yahoo accepts for an interval
+
+    The start is clipped to the oldest day Yahoo still serves, so ranges
+    reaching further back do not turn into requests that can only fail.
+    """
+    _check_interval(interval)
+    window_days, lookback_days = INTRADAY_LIMITS[interval]
+    today = today or dt.date.today()
+    start = max(_to_date(start_date), today - dt.timedelta(days=lookback_days - 1))
+    end = _to_date(end_date)
+    windows = []
+    while start < end:
+        stop = min(end, start + dt.timedelta(days=window_days))
+        windows.append((start, stop))
+        start = stop
+    return windows
+
+
+def normalize_intraday(data):
+    """Converts a yfinance intraday frame to the datetime/OHLCV layout in UTC"""
+    data = normalize_history(data, INTRADAY_COLUMNS)
+    stamps = pd.to_datetime(data['datetime'])
+    # Exchanges report in local time; UTC keeps windows across DST changes in order
+    return data.assign(datetime=stamps.dt.tz_localize("UTC") if stamps.dt.tz is None else stamps.dt.tz_convert("UTC"))
+
+
+def download_intraday(ticker, start_date, end_date, interval, session=None,
+                      max_workers=DEFAULT_WINDOW_WORKERS):
+    """Downloads intraday bars, fetching the allowed windows concurrently
+
+    Overlapping bars are de-duplicated and the result is one contiguous,
+    time-ordered frame with tz-aware UTC timestamps.
+    """
+    windows = split_range(start_date, end_date, interval)
+    if not windows:
+        raise NoDataError(f"Yahoo Finance keeps {interval} bars for {INTRADAY_LIMITS[interval][1]} days only.")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+        results = list(executor.map(
+            lambda window: download_bars(ticker, window[0], window[1], interval, session),
+            windows
+        ))
+
+    frames = [normalize_intraday(data) for data in results if data is not None and not data.empty]
+    if not frames:
+        raise NoDataError(f"No {interval} data available for {ticker} in the specified date range.")
+
+    data = pd.concat(frames, ignore_index=True)
+    return (data.drop_duplicates(subset='datetime', keep='last')
+                .sort_values('datetime')
+                .reset_index(drop=True))
+
+
+class IntradayStore:
+    """Intraday bars stored as one Parquet file per ticker, interval and UTC day
+
+    Files live under <root>/<interval>/<ticker>/<YYYY-MM-DD>.parquet. A
+    _days.json sidecar lists the days already requested (including days
+    without bars), so later queries read only the days they need and
+    download only the days never fetched.
+    """
+
+    def __init__(self, root=DEFAULT_INTRADAY_DIR, downloader=download_intraday):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.downloader = downloader
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((ticker, interval), threading.Lock())
+
+    def _dir(self, ticker, interval):
+        # Tickers such as "BRK-B", "2222.SR" or "^GSPC" need a filesystem-safe name
+        return self.root / interval / re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+
+    def covered_days(self, ticker, interval):
+        """Returns the set of UTC days already requested from the network"""
+        meta_path = self._dir(ticker, interval) / "_days.json"
+        if not meta_path.exists():
+            return set()
+        with open(meta_path) as f:
+            return {dt.date.fromisoformat(day) for day in json.load(f).get("days", [])}
+
+    def _write_day(self, directory, day, bars):
+        path = directory / f"{day.isoformat()}.parquet"
+        if path.exists():
+            # Padding around a request can revisit a stored day; keep the newest bars
+            bars = pd.concat([pd.read_parquet(path), bars], ignore_index=True)
+            bars = bars.drop_duplicates(subset='datetime', keep='last').sort_values('datetime')
+        # Write to a temporary file first so a crash never leaves a torn partition
+        tmp = path.with_suffix(".parquet.tmp")
+        bars.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+    def _write_days(self, directory, covered):
+        tmp = directory / "_days.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"days": sorted(day.isoformat() for day in covered)}, f)
+        os.replace(tmp, directory / "_days.json")
+
+    def update(self, ticker, start_date, end_date, interval, session=None):
+        """Downloads the days of [start_date, end_date) that were never fetched"""
+        _check_interval(interval)
+        today = dt.datetime.now(dt.timezone.utc).date()
+        windows = split_range(start_date, end_date, interval, today=today)
+        if not windows:
+            return 0
+        first, last = windows[0][0], windows[-1][1]
+
+        with self._lock(ticker, interval):
+            covered = self.covered_days(ticker, interval)
+            wanted = [first + dt.timedelta(days=i) for i in range((last - first).days)]
+            missing = [day for day in wanted if day not in covered]
+            if not missing:
+                return 0
+
+            # Runs of consecutive missing days, so stored days in between are not re-downloaded
+            runs = [[missing[0], missing[0]]]
+            for day in missing[1:]:
+                if day == runs[-1][1] + dt.timedelta(days=1):
+                    runs[-1][1] = day
+                else:
+                    runs.append([day, day])
+
+            directory = self._dir(ticker, interval)
+            directory.mkdir(parents=True, exist_ok=True)
+            new_rows = 0
+            try:
+                for run_start, run_end in runs:
+                    # Yahoo takes exchange-local dates, so pad a day each side to cover whole UTC days
+                    try:
+                        data = self.downloader(ticker, run_start - dt.timedelta(days=1),
+                                               run_end + dt.timedelta(days=2), interval, session=session)
+                    except NoDataError:
+                        # Runs of weekends or holidays legitimately have no bars
+                        data = None
+                    if data is not None:
+                        for day, bars in data.groupby(data['datetime'].dt.date):
+                            self._write_day(directory, day, bars.reset_index(drop=True))
+                        new_rows += len(data)
+                    # Only runs that were answered count as covered, and today's bars
+                    # are still forming, so today is never marked
+                    covered.update(day for day in missing if run_start <= day <= run_end and day < today)
+            finally:
+                # Any other error propagates, but the runs stored before it stay covered
+                self._write_days(directory, covered)
+            return new_rows
+
+    def read(self, ticker, start_date, end_date, interval):
+        """Returns stored bars in [start_date, end_date) UTC, reading only those days' files"""
+        directory = self._dir(ticker, interval)
+        start, end = _to_date(start_date), _to_date(end_date)
+        paths = [directory / f"{(start + dt.timedelta(days=i)).isoformat()}.parquet"
+                 for i in range((end - start).days)]
+        frames = [pd.read_parquet(path) for path in paths if path.exists()]
+        if not frames:
+            return pd.DataFrame(columns=INTRADAY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch(self, ticker, start_date, end_date, interval="5m", session=None):
+        """Same contract as download_intraday, serving from the store first"""
+        self.update(ticker, start_date, end_date, interval, session=session)
+        data = self.read(ticker, start_date, end_date, interval)
+        if data.empty:
+            raise NoDataError(f"No {interval} data available for {ticker} in the specified date range.")
+        return data
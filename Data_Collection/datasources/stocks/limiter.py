@@ -0,0 +1,58 @@
+import os
+import threading
+import time
+
+# Yahoo does not publish its limits; start moderate and let the limiter adapt
+DEFAULT_RATE = float(os.environ.get("YAHOO_RATE", 4))
+DEFAULT_MIN_RATE = float(os.environ.get("YAHOO_MIN_RATE", 0.2))
+DEFAULT_MAX_RATE = float(os.environ.get("YAHOO_MAX_RATE", 10))
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe request pacer with additive-increase / multiplicative-decrease
+
+    acquire() spaces requests at the current rate (requests per second).
+    throttled() halves the rate and pauses everyone for a cool-down;
+    succeeded() adds a small step back, so the rate recovers gradually
+    instead of bouncing straight back into the limit.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 increase=0.1, decrease=0.5, cooldown=5.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.throttle_count = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until the caller may send its request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self):
+        with self._lock:
+            self.throttle_count += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Nobody sends until the cool-down has passed
+            self._next_slot = max(self._next_slot, time.monotonic() + self.cooldown)
+
+    def snapshot(self):
+        with self._lock:
+            return {"rate": round(self.rate, 3), "throttled": self.throttle_count}
+
+
+# Shared by every Yahoo request in the process
+YAHOO_LIMITER = AdaptiveRateLimiter()
@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import threading
+import datetime as dt
+from pathlib import Path
+import pandas as pd
+
+from ..base import DATA_DIR, NoDataError
+from .history import OHLCV_COLUMNS, download_history
+
+# Default location of the local bar store, overridable for deployments
+DEFAULT_STORE_DIR = os.environ.get(
+    "STOCK_STORE_DIR",
+    str(DATA_DIR / "stocks" / "ohlcv")
+)
+
+
+def _to_date(value):
+    return pd.Timestamp(value).date()
+
+
+def _merge_ranges(ranges):
+    """Merges overlapping or touching [start, end) date ranges"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _missing_ranges(covered, start, end):
+    """Returns the parts of [start, end) not contained in the covered ranges"""
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, min(cov_start, end)))
+        cursor = max(cursor, cov_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class OHLCVStore:
+    """Per-ticker Parquet store of daily bars that only downloads missing date ranges
+
+    Each ticker is kept as <root>/<ticker>.parquet with a <ticker>.json sidecar
+    listing the [start, end) ranges already requested from the network, so that
+    weekends and holidays inside a fetched range are not re-requested.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, downloader=download_history):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.downloader = downloader
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker):
+        # Tickers such as "BRK-B", "2222.SR" or "^GSPC" need a filesystem-safe name
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.root / f"{safe}.parquet", self.root / f"{safe}.json"
+
+    def coverage(self, ticker):
+        """Returns the merged list of [start, end) date ranges already fetched"""
+        _, meta_path = self._paths(ticker)
+        if not meta_path.exists():
+            return []
+        with open(meta_path) as f:
+            ranges = json.load(f).get("covered", [])
+        return _merge_ranges([[_to_date(s), _to_date(e)] for s, e in ranges])
+
+    def load(self, ticker):
+        """Returns every stored bar for a ticker, or an empty frame"""
+        data_path, _ = self._paths(ticker)
+        if not data_path.exists():
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return pd.read_parquet(data_path)
+
+    def read(self, ticker, start_date, end_date):
+        """Returns stored bars in [start_date, end_date) without touching the network"""
+        data = self.load(ticker)
+        if data.empty:
+            return data
+        days = pd.to_datetime(data['date']).dt.date
+        mask = (days >= _to_date(start_date)) & (days < _to_date(end_date))
+        return data[mask].reset_index(drop=True)
+
+    def _write(self, ticker, data, covered):
+        data_path, meta_path = self._paths(ticker)
+        # Write to temporary files first so a crash never leaves a torn partition
+        tmp_data = data_path.with_suffix(".parquet.tmp")
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        data.to_parquet(tmp_data, index=False)
+        with open(tmp_meta, "w") as f:
+            json.dump({"covered": [[s.isoformat(), e.isoformat()] for s, e in covered]}, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    def update(self, ticker, start_date, end_date, session=None):
+        """Downloads whatever part of [start_date, end_date) is not yet stored"""
+        start, end = _to_date(start_date), _to_date(end_date)
+        # Today's bar is still forming, so never mark it as covered
+        coverable_end = min(end, dt.date.today())
+
+        with self._lock(ticker):
+            covered = self.coverage(ticker)
+            gaps = _missing_ranges(covered, start, end)
+            if not gaps:
+                return 0
+
+            new_frames = []
+            covered_before = len(covered)
+            for gap_start, gap_end in gaps:
+                try:
+                    new_frames.append(self.downloader(ticker, gap_start, gap_end, session=session))
+                except NoDataError:
+                    # Gaps made only of weekends or holidays legitimately have no bars;
+                    # any other error propagates and leaves the gap uncovered
+                    pass
+                if gap_start < coverable_end:
+                    covered.append([gap_start, min(gap_end, coverable_end)])
+
+            new_rows = sum(len(frame) for frame in new_frames)
+            if new_rows or len(covered) != covered_before:
+                stored = self.load(ticker)
+                frames = [frame for frame in [stored] + new_frames if not frame.empty]
+                data = pd.concat(frames, ignore_index=True) if frames else stored
+                data = (data.drop_duplicates(subset='date', keep='last')
+                            .sort_values('date')
+                            .reset_index(drop=True))
+                self._write(ticker, data[OHLCV_COLUMNS], _merge_ranges(covered))
+            return new_rows
+
+    def fetch(self, ticker, start_date, end_date, session=None):
+        """Drop-in replacement for download_history that serves from the store first"""
+        self.update(ticker, start_date, end_date, session=session)
+        data = self.read(ticker, start_date, end_date)
+        if data.empty:
+            raise NoDataError(f"No data available for {ticker} in the specified date range.")
+        return data
@@ -0,0 +1,69 @@
+from ..base import DataSource, NoDataError
+from .bulk import DEFAULT_MAX_WORKERS, fetch_indicator, fetch_wb_panel
+from .catalogue import IndicatorCatalogue
+
+# Unit suffixes of World Bank indicator names -> short display units
+UNIT_MAPPING = {
+    "current US$": "US$",
+    "annual %": "%",
+    "metric tons per capita": "tons/capita",
+    "% of land area": "%",
+    "% of total": "%",
+    "per 1,000 live births": "per 1000",
+    "per 1,000 people": "per 1000",
+    "% of people ages 15 and above": "%",
+    "% gross": "%",
+    "% of GDP": "%"
+}
+
+
+def indicator_unit(indicator_name):
+    """Returns the short unit for an indicator name, or '' if none is recognised"""
+    return next((v for k, v in UNIT_MAPPING.items() if k in indicator_name), "")
+
+
+class WorldBankSource(DataSource):
+    """World Bank Indicators API v2, with the local indicator catalogue for metadata"""
+
+    name = "worldbank"
+
+    columns = {
+        'Country': 'Country name',
+        'Country Code': 'ISO3 country code',
+        'Indicator Code': 'World Bank indicator code',
+        'Indicator': 'Indicator name',
+        'Year': 'Year of the observation',
+        'Value': 'Observation value',
+        'Unit': 'Unit of measure'
+    }
+
+    def __init__(self, catalogue=None, **kwargs):
+        super().__init__(**kwargs)
+        self.catalogue = catalogue or IndicatorCatalogue()
+
+    def _fetch(self, indicator_code, country_code, start_year, end_year):
+        country_codes = [country_code] if isinstance(country_code, str) else list(country_code)
+        df = fetch_indicator(indicator_code, country_codes, start_year, end_year)
+        df = df.dropna(subset=['Year'])
+        if df.empty:
+            raise NoDataError("No data available for the selected parameters")
+
+        df['Year'] = df['Year'].astype(int)
+        # Units are derived once per indicator, not per row
+        df['Unit'] = df['Indicator'].map({name: indicator_unit(name) for name in df['Indicator'].unique()})
+        return df.sort_values(['Country Code', 'Year'])[list(self.columns)].reset_index(drop=True)
+
+    def fetch_panel(self, indicator_codes, country_codes, start_year, end_year,
+                    max_workers=DEFAULT_MAX_WORKERS):
+        """Fetches an indicators x countries panel; returns (panel, errors by indicator)"""
+        return fetch_wb_panel(list(indicator_codes), list(country_codes), start_year, end_year,
+                              max_workers=max_workers)
+
+    def metadata(self, indicator_code):
+        """Returns the catalogue entry (name, source, definition) for an indicator"""
+        self.catalogue.ensure()
+        return self.catalogue.definition(indicator_code)
+
+    def search(self, query, limit=50):
+        self.catalogue.ensure()
+        return self.catalogue.search(query, limit=limit)
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import pandas as pd
+
+from ..aio import get_client, run
+
+# World Bank Indicators API v2, overridable to point at a mock server
+DEFAULT_API_URL = os.environ.get("WB_API_URL", "https://api.worldbank.org/v2")
+
+# Countries per request; semicolon-joined lists keep the URL well under server limits
+COUNTRIES_PER_REQUEST = 60
+
+# Default number of concurrent API requests per panel
+DEFAULT_MAX_WORKERS = 8
+
+PANEL_COLUMNS = ['Country', 'Country Code', 'Indicator Code', 'Indicator', 'Year', 'Value']
+
+
+def plan_requests(indicator_codes, country_codes, countries_per_request=COUNTRIES_PER_REQUEST):
+    """Returns the (indicator, [countries]) pairs needed to cover the whole panel
+
+    The API accepts one indicator per call (outside a single source) but many
+    semicolon-joined countries, so the panel needs one call per indicator and
+    country chunk instead of one per indicator-country pair.
+    """
+    countries = list(dict.fromkeys(country_codes))
+    chunks = [countries[i:i + countries_per_request] for i in range(0, len(countries), countries_per_request)]
+    return [(indicator, chunk) for indicator in dict.fromkeys(indicator_codes) for chunk in chunks]
+
+
+def _page_records(indicator_code, payload):
+    # Errors come back as a single message object instead of [meta, rows]
+    if not isinstance(payload, list) or len(payload) < 2:
+        message = payload[0].get('message') if isinstance(payload, list) and payload else payload
+        raise ValueError(f"World Bank API error for {indicator_code}: {message}")
+    return int(payload[0].get('pages') or 1), payload[1] or []
+
+
+async def fetch_indicator_async(indicator_code, country_codes, start_year, end_year,
+                                base_url=DEFAULT_API_URL, timeout=60):
+    """Downloads one indicator for a list of countries; pages after the first are fetched concurrently"""
+    client = get_client()
+    url = f"{base_url.rstrip('/')}/country/{';'.join(country_codes)}/indicator/{indicator_code}"
+
+    def params(page):
+        return {'date': f"{start_year}:{end_year}", 'format': 'json', 'per_page': 20000, 'page': page}
+
+    pages, records = _page_records(indicator_code, await client.get_json(url, params(1), timeout))
+    if pages > 1:
+        payloads = await asyncio.gather(*(client.get_json(url, params(page), timeout) for page in range(2, pages + 1)))
+        for payload in payloads:
+            records.extend(_page_records(indicator_code, payload)[1])
+
+    return pd.DataFrame({
+        'Country': [r['country']['value'] for r in records],
+        'Country Code': [r.get('countryiso3code') or r['country']['id'] for r in records],
+        'Indicator Code': [r['indicator']['id'] for r in records],
+        'Indicator': [r['indicator']['value'] for r in records],
+        'Year': pd.to_numeric([r['date'] for r in records], errors='coerce'),
+        'Value': pd.to_numeric([r['value'] for r in records], errors='coerce'),
+    }, columns=PANEL_COLUMNS)
+
+
+def fetch_indicator(indicator_code, country_codes, start_year, end_year,
+                    base_url=DEFAULT_API_URL, timeout=60):
+    """Downloads one indicator for a list of countries, following pagination"""
+    return run(fetch_indicator_async(indicator_code, country_codes, start_year, end_year, base_url, timeout))
+
+
+async def _fetch_plan(plan, start_year, end_year, max_workers, base_url):
+    # Bounds in-flight calls per panel on top of the client's per-host cap
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch(indicator, chunk):
+        async with semaphore:
+            return await fetch_indicator_async(indicator, chunk, start_year, end_year, base_url)
+
+    return await asyncio.gather(*(fetch(indicator, chunk) for indicator, chunk in plan), return_exceptions=True)
+
+
+def fetch_wb_panel(indicator_codes, country_codes, start_year, end_year,
+                   max_workers=DEFAULT_MAX_WORKERS, base_url=DEFAULT_API_URL):
+    """Fetches an indicators x countries panel with batched, concurrent API calls
+
+    Returns a tidy frame (one row per country, indicator and year) and a dict
+    mapping each failed indicator to its error message.
+    """
+    plan = plan_requests(indicator_codes, country_codes)
+    frames, errors = [], {}
+    if not plan:
+        return pd.DataFrame(columns=PANEL_COLUMNS), errors
+
+    results = run(_fetch_plan(plan, start_year, end_year, max(1, max_workers), base_url))
+    for (indicator, _), result in zip(plan, results):
+        if isinstance(result, Exception):
+            errors[indicator] = str(result)
+        else:
+            frames.append(result)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=PANEL_COLUMNS), errors
+
+    panel = pd.concat(frames, ignore_index=True)
+    panel = panel.dropna(subset=['Year'])
+    panel['Year'] = panel['Year'].astype(int)
+    return panel.sort_values(['Indicator Code', 'Country Code', 'Year']).reset_index(drop=True), errors
@@ -0,0 +1,145 @@
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+import pandas as pd
+
+from ..base import DATA_DIR
+from ..aio import fetch_json
+from .bulk import DEFAULT_API_URL
+
+# Catalogue file and refresh interval, overridable for deployments
+DEFAULT_CATALOGUE_PATH = os.environ.get(
+    "WB_CATALOGUE_PATH",
+    str(DATA_DIR / "worldbank" / "indicators.sqlite")
+)
+DEFAULT_CATALOGUE_TTL = int(os.environ.get("WB_CATALOGUE_TTL", 30 * 24 * 3600))
+
+
+def download_indicators(base_url=DEFAULT_API_URL, timeout=120):
+    """Downloads the full World Bank indicator list as a frame"""
+    records = []
+    page, pages = 1, 1
+    while page <= pages:
+        meta, rows = fetch_json(f"{base_url.rstrip('/')}/indicator", params={
+            'format': 'json',
+            'per_page': 20000,
+            'page': page
+        }, timeout=timeout)
+        pages = int(meta.get('pages') or 1)
+        records.extend(rows or [])
+        page += 1
+
+    return pd.DataFrame({
+        'id': [r['id'] for r in records],
+        'name': [r.get('name') or '' for r in records],
+        'source': [(r.get('source') or {}).get('value') or '' for r in records],
+        'note': [r.get('sourceNote') or '' for r in records],
+        'topics': ['; '.join(t.get('value') or '' for t in r.get('topics') or [] if t) for r in records],
+    })
+
+
+class IndicatorCatalogue:
+    """Local SQLite copy of the World Bank indicator list with a full-text index
+
+    Names, codes and notes are indexed with FTS5 (prefix-enabled), so searches
+    and definition lookups are answered from disk without calling the API.
+    The catalogue is rebuilt from the API once it is older than ttl_seconds.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOGUE_PATH, ttl_seconds=DEFAULT_CATALOGUE_TTL,
+                 downloader=download_indicators):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.downloader = downloader
+        # Reentrant so ensure() can hold it across its freshness check and build()
+        self._build_lock = threading.RLock()
+
+    def _connect(self):
+        # closing() releases the file handle; sqlite3's own context manager only commits
+        return closing(sqlite3.connect(self.path))
+
+    def is_fresh(self):
+        if not self.path.exists():
+            return False
+        try:
+            with self._connect() as conn:
+                built = conn.execute("SELECT value FROM meta WHERE key = 'built'").fetchone()
+        except sqlite3.DatabaseError:
+            return False
+        return built is not None and time.time() - float(built[0]) <= self.ttl_seconds
+
+    def build(self, indicators=None):
+        """(Re)builds the catalogue from a frame, downloading it if none is given"""
+        indicators = self.downloader() if indicators is None else indicators
+        indicators = indicators.drop_duplicates(subset='id')
+
+        # Build into a temporary file of its own and swap it in, so readers never
+        # see a partial index and concurrent builds (other processes too) never share a file
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.stem}.", suffix=".tmp")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            with self._build_lock, closing(sqlite3.connect(tmp_path)) as conn:
+                conn.executescript("""
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                    CREATE TABLE indicators (id TEXT PRIMARY KEY, name TEXT, source TEXT, note TEXT, topics TEXT);
+                    CREATE VIRTUAL TABLE indicators_fts USING fts5(
+                        id, name, note, topics,
+                        content='indicators', tokenize='unicode61', prefix='2 3 4'
+                    );
+                """)
+                conn.executemany(
+                    "INSERT INTO indicators (id, name, source, note, topics) VALUES (?, ?, ?, ?, ?)",
+                    indicators[['id', 'name', 'source', 'note', 'topics']].itertuples(index=False, name=None)
+                )
+                conn.execute("INSERT INTO indicators_fts (indicators_fts) VALUES ('rebuild')")
+                conn.execute("INSERT INTO meta VALUES ('built', ?)", (str(time.time()),))
+                conn.commit()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def ensure(self):
+        """Builds the catalogue on first use or once it has expired"""
+        if self.is_fresh():
+            return
+        with self._build_lock:
+            # Another thread may have rebuilt it while this one waited
+            if not self.is_fresh():
+                self.build()
+
+    def search(self, query, limit=50):
+        """Returns indicators matching every word of query as a prefix
+
+        An exact indicator code match is always ranked first, then matches in
+        the code and name outrank matches in the notes.
+        """
+        tokens = re.findall(r"\w+", query or "")
+        if not tokens:
+            return pd.DataFrame(columns=['id', 'name', 'source'])
+        match = " ".join(f'"{token}"*' for token in tokens)
+        with self._connect() as conn:
+            return pd.read_sql_query("""
+                SELECT i.id, i.name, i.source
+                FROM indicators_fts f JOIN indicators i ON i.rowid = f.rowid
+                WHERE indicators_fts MATCH ?
+                ORDER BY (upper(i.id) = upper(?)) DESC, bm25(indicators_fts, 10.0, 5.0, 1.0, 1.0)
+                LIMIT ?
+            """, conn, params=(match, query.strip(), limit))
+
+    def definition(self, indicator_code):
+        """Returns name, source and note for one indicator code, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT name, source, note FROM indicators WHERE id = ?", (indicator_code,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'name': row[0], 'source': row[1], 'note': row[2]}
@@ -0,0 +1,136 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from datasources import NoDataError
+from datasources.export import EXPORT_FORMATS, export_file_name, spool_export
+
+# Rows sent to the browser per table page
+TABLE_PAGE_SIZE = 500
+
+# Dark-theme cell colours: muted for text columns, white for values
+TEXT_CELL_STYLE = 'color: #B0B0B0'
+VALUE_CELL_STYLE = 'color: white'
+
+
+def run_fetch(source, label, **query):
+    """Runs source.fetch(**query), reporting failures in the page instead of raising"""
+    try:
+        return source.fetch(**query)
+    except NoDataError as e:
+        st.warning(str(e))
+    except Exception as e:
+        st.error(f"Error fetching {label} data: {str(e)}")
+    return None
+
+
+def metric_cards(df, value_format="{:,.2f}"):
+    """First value, last value and percentage change cards for a Year/Value/Unit frame"""
+    # Filter out NA values for calculations
+    clean_df = df.dropna(subset=['Value'])
+    if clean_df.empty:
+        st.warning("No valid data points available for metrics calculation")
+        return
+
+    first, last = clean_df.iloc[0], clean_df.iloc[-1]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            "First Year Value",
+            f"{value_format.format(first['Value'])} {first['Unit']}",
+            help=f"Value in {first['Year']}"
+        )
+    with col2:
+        st.metric(
+            "Last Year Value",
+            f"{value_format.format(last['Value'])} {last['Unit']}",
+            help=f"Value in {last['Year']}"
+        )
+    with col3:
+        change = ((last['Value'] - first['Value']) / first['Value']) * 100
+        st.metric(
+            "Change Over Period",
+            f"{change:.1f}%",
+            delta_color="inverse" if change < 0 else "normal",
+            help=f"Percentage change from {first['Year']} to {last['Year']}"
+        )
+
+
+def column_styles(df):
+    """CSS for every cell in one pass, chosen per column dtype rather than per cell"""
+    text = np.array([
+        pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+        or isinstance(dtype, pd.CategoricalDtype)
+        for dtype in df.dtypes
+    ], dtype=bool)
+    styles = np.where(text, TEXT_CELL_STYLE, VALUE_CELL_STYLE).astype(object)
+    return pd.DataFrame(np.broadcast_to(styles, df.shape), index=df.index, columns=df.columns)
+
+
+def styled_table(df, key, page_size=TABLE_PAGE_SIZE, **kwargs):
+    """Dark-styled st.dataframe that only sends the current page of rows"""
+    pages = max(1, -(-len(df) // page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    window = df.iloc[start:start + page_size]
+    if pages > 1:
+        st.caption(f"Rows {start + 1:,}-{start + len(window):,} of {len(df):,}")
+
+    st.dataframe(
+        window.style.apply(column_styles, axis=None),
+        hide_index=True,
+        use_container_width=True,
+        height=min(400, 35 * (len(window) + 1)),
+        **kwargs
+    )
+
+
+def frame_fingerprint(df):
+    """Content key for a frame: shape, dtypes and a hash of every row
+
+    hash_pandas_object is vectorised, so hashing all rows stays cheap next
+    to the exports and charts it keys, and an edit to any row changes it.
+    """
+    rows = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    layout = repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode()
+    return hashlib.blake2b(layout + rows.tobytes(), digest_size=16).hexdigest()
+
+
+def data_download(df, base_name, key, label="💾 Download", formats=tuple(EXPORT_FORMATS), **kwargs):
+    """Format picker plus download button; the file is only built when asked for
+
+    The prepared file is kept in the session per key and reused on reruns
+    until the frame or the format changes.
+    """
+    fmt = st.selectbox("Export format", formats, format_func=lambda f: EXPORT_FORMATS[f][0], key=f"{key}_format")
+    format_label, _, mime = EXPORT_FORMATS[fmt]
+    token = (fmt, frame_fingerprint(df))
+    exports = st.session_state.setdefault("_exports", {})
+
+    prepared = exports.get(key)
+    if prepared is None or prepared[0] != token:
+        if not st.button(f"Prepare {format_label} export", key=f"{key}_prepare", **kwargs):
+            return
+        with st.spinner(f"Writing {format_label}..."):
+            # Written in chunks to a spooled file; large exports stay on disk between reruns
+            spool = spool_export(df, fmt)
+            if prepared is not None:
+                # One prepared file per key, so switching formats does not pile up files
+                prepared[1].close()
+            prepared = exports[key] = (token, spool)
+
+    spool = prepared[1]
+    spool.seek(0)
+    st.download_button(
+        f"{label} {format_label}",
+        # Read only for the button, so the session keeps no in-memory copy of the file
+        spool.read(),
+        file_name=export_file_name(base_name, fmt),
+        mime=mime,
+        key=f"{key}_download",
+        **kwargs
+    )
@@ -0,0 +1,23 @@
+"""Reusable pieces of the Titanic notebook (titanic_kaggle.ipynb)
+
+Import from the notebook's folder:
+
+    from titanic import TitanicPreprocessor
+"""
+import importlib
+
+# Name -> module:attribute, imported on first use so that scoring with
+# titanic.inference only pays for NumPy, not scikit-learn or pandas
+EXPORTS = {
+    "TARGET": "preprocessing:TARGET",
+    "TitanicPreprocessor": "preprocessing:TitanicPreprocessor",
+    "ImputationEngine": "imputation:ImputationEngine",
+    "NumpyMLP": "inference:NumpyMLP",
+}
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = EXPORTS[name].split(":")
+    return getattr(importlib.import_module(f".{module}", __name__), attr)
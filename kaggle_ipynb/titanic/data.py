@@ -0,0 +1,152 @@
+"""Typed, chunked loading of competition CSVs with a Parquet cache
+
+The CSV is read chunk_rows rows at a time with explicit dtypes (small
+integers and floats, categoricals for repeated labels) and each chunk is
+appended to a Parquet file as its own row group. Later loads read the
+Parquet copy, optionally only some columns, and training or scoring can
+stream it in batches of NumPy arrays, so files larger than memory never
+have to be loaded whole.
+"""
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows parsed per CSV chunk (and stored per Parquet row group)
+CHUNK_ROWS = 100_000
+
+# Rows per batch handed to a model
+BATCH_SIZE = 1024
+
+# Repeated labels, stored as categoricals
+CATEGORICAL_COLUMNS = ['Sex', 'Embarked', 'Cabin']
+
+# Explicit dtypes for train.csv and test.csv; columns absent from a file are ignored
+TITANIC_DTYPES = {
+    'PassengerId': 'int32',
+    'Survived': 'int8',
+    'Pclass': 'int8',
+    'Name': 'str',
+    'Age': 'float32',
+    'SibSp': 'int8',
+    'Parch': 'int8',
+    'Ticket': 'str',
+    'Fare': 'float32',
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+}
+
+
+def _downcast(chunk, dtypes):
+    # Columns without an explicit dtype: floats become float32, integers stay as parsed
+    for col in chunk.columns:
+        if col not in dtypes and pd.api.types.is_float_dtype(chunk[col]):
+            chunk[col] = chunk[col].astype(np.float32)
+    return chunk
+
+
+def read_csv_chunks(csv_path, dtypes=TITANIC_DTYPES, chunk_rows=CHUNK_ROWS):
+    """Yields the CSV as typed frames of at most chunk_rows rows"""
+    with pd.read_csv(csv_path, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield _downcast(chunk, dtypes)
+
+
+def _arrow_schema(chunk, dtypes):
+    """Parquet schema for every chunk, taken from the declared dtypes where inference can fail
+
+    A column that is all missing in the first chunk would otherwise be
+    typed null, and later chunks with values could not be written.
+    """
+    inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+    fields = []
+    for field in inferred:
+        if dtypes.get(field.name) == 'category' or pa.types.is_dictionary(field.type):
+            # Categories differ between chunks, so fix the dictionary index width up front
+            field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+        elif pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields, metadata=inferred.metadata)
+
+
+def parquet_path_for(csv_path):
+    """Where the Parquet copy of a CSV is cached: next to it, same name"""
+    return Path(csv_path).with_suffix('.parquet')
+
+
+def cache_parquet(csv_path, parquet_path=None, dtypes=TITANIC_DTYPES, chunk_rows=CHUNK_ROWS):
+    """Converts a CSV to Parquet chunk by chunk unless an up-to-date copy exists
+
+    Returns the Parquet path. The copy is rebuilt when the CSV is newer.
+    """
+    parquet_path = Path(parquet_path or parquet_path_for(csv_path))
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= os.stat(csv_path).st_mtime:
+        return parquet_path
+
+    # Write to a temporary file first so an interrupted conversion never looks cached
+    tmp = parquet_path.with_suffix('.parquet.tmp')
+    writer = None
+    try:
+        for chunk in read_csv_chunks(csv_path, dtypes, chunk_rows):
+            if writer is None:
+                schema = _arrow_schema(chunk, dtypes)
+                writer = pq.ParquetWriter(tmp, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        writer.close()
+        writer = None
+        os.replace(tmp, parquet_path)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    return parquet_path
+
+
+def load_frame(csv_path, columns=None, **kwargs):
+    """Typed frame of a CSV, read from its Parquet cache (only the given columns)"""
+    return pd.read_parquet(cache_parquet(csv_path, **kwargs), columns=columns)
+
+
+def iter_batches(csv_path, batch_size=BATCH_SIZE, columns=None, transform=None, target=None, keep=None,
+                 **kwargs):
+    """Yields NumPy batches of at most batch_size rows from a CSV's Parquet cache
+
+    transform turns each raw frame into features (e.g. a fitted
+    TitanicPreprocessor's transform). With target, batches are (X, y);
+    otherwise just X. keep maps a raw frame to a boolean mask of the rows
+    to yield, e.g. the training split's PassengerIds. Rows keep the file
+    order.
+    """
+    parquet = pq.ParquetFile(cache_parquet(csv_path, **kwargs))
+    for record_batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        frame = record_batch.to_pandas()
+        if keep is not None:
+            frame = frame[keep(frame)]
+            if frame.empty:
+                continue
+        features = transform(frame) if transform is not None else frame.drop(columns=target, errors='ignore')
+        X = np.asarray(features, dtype=np.float32)
+        if target is None:
+            yield X
+        else:
+            yield X, frame[target].to_numpy(dtype=np.float32)
+
+
+def tf_dataset(make_batches, n_features, with_target=True):
+    """tf.data.Dataset over a batch generator factory, e.g. lambda: iter_batches(...)
+
+    make_batches is called again for every epoch. TensorFlow is only
+    imported here, so the rest of the module works without it.
+    """
+    import tensorflow as tf
+
+    features = tf.TensorSpec(shape=(None, n_features), dtype=tf.float32)
+    if with_target:
+        signature = (features, tf.TensorSpec(shape=(None,), dtype=tf.float32))
+    else:
+        signature = features
+    return tf.data.Dataset.from_generator(make_batches, output_signature=signature).prefetch(tf.data.AUTOTUNE)
@@ -0,0 +1,113 @@
+"""TensorFlow-free scoring of the notebook's dense network
+
+export_weights() copies a trained tf.keras Sequential of Dense layers to a
+.npz file of plain arrays. NumpyMLP loads that file and runs the forward
+pass as batched float32 matrix products, so scoring only imports NumPy and
+starts in milliseconds instead of waiting seconds for TensorFlow.
+"""
+import time
+
+import numpy as np
+
+# Rows per forward pass; large enough for BLAS, small enough to stay in cache-friendly memory
+BATCH_SIZE = 8192
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    # 1 / (1 + exp(-x)) in place, without overflow warnings for very negative x
+    np.negative(x, out=x)
+    np.exp(np.minimum(x, 80, out=x), out=x)
+    x += 1
+    return np.reciprocal(x, out=x)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {'relu': _relu, 'sigmoid': _sigmoid, 'linear': _linear}
+
+
+def export_weights(model, path):
+    """Writes the kernels, biases and activations of a Sequential Dense model to .npz"""
+    arrays = {}
+    activations = []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        if len(weights) != 2 or not hasattr(layer, 'activation'):
+            raise ValueError(f"Layer '{layer.name}' is not a Dense layer with a bias; only Dense networks can be exported")
+        activation = layer.activation.__name__
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation '{activation}'. Available: {', '.join(ACTIVATIONS)}")
+        arrays[f"kernel_{len(activations)}"] = np.asarray(weights[0], dtype=np.float32)
+        arrays[f"bias_{len(activations)}"] = np.asarray(weights[1], dtype=np.float32)
+        activations.append(activation)
+    np.savez(path, activations=np.array(activations), **arrays)
+    return path
+
+
+class NumpyMLP:
+    """Forward pass of an exported Dense network in NumPy"""
+
+    def __init__(self, kernels, biases, activations):
+        self.kernels = [np.ascontiguousarray(kernel, dtype=np.float32) for kernel in kernels]
+        self.biases = [np.asarray(bias, dtype=np.float32) for bias in biases]
+        self.activations = list(activations)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            activations = [str(name) for name in data['activations']]
+            return cls([data[f"kernel_{i}"] for i in range(len(activations))],
+                       [data[f"bias_{i}"] for i in range(len(activations))],
+                       activations)
+
+    def _forward(self, X):
+        out = np.asarray(X, dtype=np.float32)
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            out = out @ kernel
+            out += bias
+            out = ACTIVATIONS[activation](out)
+        return out
+
+    def predict_proba(self, X, batch_size=BATCH_SIZE):
+        """Network outputs for X, computed batch_size rows at a time (same shape as model.predict)"""
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) <= batch_size:
+            return self._forward(X)
+        return np.concatenate([self._forward(X[start:start + batch_size])
+                               for start in range(0, len(X), batch_size)])
+
+    def predict(self, X, threshold=0.5, batch_size=BATCH_SIZE):
+        """0/1 labels for a single sigmoid output"""
+        return (self.predict_proba(X, batch_size)[:, 0] > threshold).astype(np.int8)
+
+
+def _rows_per_second(score, X, repeats):
+    score(X)  # warm-up: first calls pay for allocation and, in Keras, graph tracing
+    start = time.perf_counter()
+    for _ in range(repeats):
+        score(X)
+    return len(X) * repeats / (time.perf_counter() - start)
+
+
+def benchmark(mlp, X, keras_model=None, repeats=5, batch_size=BATCH_SIZE):
+    """Throughput in rows per second of NumpyMLP and, if given, keras_model.predict
+
+    Also checks that both give the same outputs on X.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    results = {'numpy_rows_per_s': _rows_per_second(lambda data: mlp.predict_proba(data, batch_size), X, repeats)}
+    if keras_model is not None:
+        results['keras_rows_per_s'] = _rows_per_second(
+            lambda data: keras_model.predict(data, batch_size=batch_size, verbose=0), X, repeats)
+        results['speedup'] = results['numpy_rows_per_s'] / results['keras_rows_per_s']
+        results['max_abs_diff'] = float(np.max(np.abs(
+            mlp.predict_proba(X, batch_size) - keras_model.predict(X, batch_size=batch_size, verbose=0))))
+    return results
@@ -0,0 +1,95 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OrdinalEncoder
+
+from .imputation import DEFAULT_WORKERS, ImputationEngine
+
+TARGET = 'Survived'
+
+# Free text that the models never see
+DROP_COLUMNS = ['Name']
+
+# Columns imputed with a random forest trained on the other features
+CATEGORICAL_IMPUTE_COLUMNS = ['Cabin', 'Embarked']
+NUMERIC_IMPUTE_COLUMNS = ['Age']
+
+
+class TitanicPreprocessor:
+    """Encoders and imputation models fitted once on train, then applied with transform
+
+    fit() learns an ordinal encoding for every text column, a fill value
+    for every column and one random forest per imputed column.
+    transform() only predicts, so validation, test and new passengers go
+    through exactly the same steps without refitting anything.
+    """
+
+    def __init__(self, categorical_impute=CATEGORICAL_IMPUTE_COLUMNS, numeric_impute=NUMERIC_IMPUTE_COLUMNS,
+                 n_estimators=100, random_state=42, max_workers=DEFAULT_WORKERS, n_jobs=None):
+        self.categorical_impute = list(categorical_impute)
+        self.numeric_impute = list(numeric_impute)
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.max_workers = max_workers
+        self.n_jobs = n_jobs
+
+    def _features(self, df):
+        return df.drop(columns=[TARGET] + DROP_COLUMNS, errors='ignore')[self.feature_columns_]
+
+    def _encode(self, X):
+        if self.text_columns_:
+            # Unseen tickets or cabins become -1; missing values stay NaN for imputation
+            codes = pd.DataFrame(self.encoder_.transform(X[self.text_columns_].astype(object)),
+                                 columns=self.text_columns_, index=X.index)
+            X = pd.concat([X.drop(columns=self.text_columns_), codes], axis=1)[self.feature_columns_]
+        return X.astype(np.float64)
+
+    def _base(self, X):
+        # Every column filled with its train median (numbers) or most frequent code (text)
+        return X.fillna(self.fill_values_)
+
+    def fit(self, df):
+        X = df.drop(columns=[TARGET] + DROP_COLUMNS, errors='ignore')
+        self.feature_columns_ = list(X.columns)
+        self.text_columns_ = [col for col in X.columns if not pd.api.types.is_numeric_dtype(X[col])]
+
+        self.encoder_ = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1,
+                                       encoded_missing_value=np.nan)
+        if self.text_columns_:
+            self.encoder_.fit(X[self.text_columns_].astype(object))
+        X = self._encode(X)
+
+        self.fill_values_ = pd.Series({
+            col: X[col].mode().iloc[0] if col in self.text_columns_ else X[col].median()
+            for col in X.columns
+        }).fillna(0)
+
+        # The per-column models are independent, so the engine trains them in parallel
+        self.engine_ = ImputationEngine(self.categorical_impute, self.numeric_impute,
+                                        n_estimators=self.n_estimators, max_workers=self.max_workers,
+                                        n_jobs=self.n_jobs, random_state=self.random_state)
+        self.engine_.fit(X, self._base(X))
+        self.imputation_metrics_ = self.engine_.metrics_
+        return self
+
+    def transform(self, df):
+        """Encoded, fully imputed feature frame for any passengers (train, test or new)"""
+        X = self._encode(self._features(df))
+        X = self.engine_.transform(X, self._base(X))
+        # Columns without a model (e.g. a Fare missing only in test) get the train fill value
+        return X.fillna(self.fill_values_)
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def save(self, path):
+        """Writes the fitted preprocessor so it can be reloaded without refitting"""
+        joblib.dump(self, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        preprocessor = joblib.load(path)
+        if not isinstance(preprocessor, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return preprocessor
@@ -0,0 +1,223 @@
+"""Cross-validated hyperparameter search for the random forest and MLP models
+
+Fold splits are preprocessed once (the TitanicPreprocessor and a scaler are
+fitted on each fold's training rows only) and cached as .npy files that the
+worker processes memory-map. Every (config, fold) pair is an independent
+task, so a search keeps all cores busy. Successive halving scores all
+configs on a small budget (trees or epochs), keeps the best 1/eta and
+repeats with eta times the budget, so weak configs never get a full run.
+"""
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from .preprocessing import TARGET, TitanicPreprocessor
+
+# Worker processes; each one's model gets an equal share of the cores
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+N_SPLITS = 5
+
+# Share of configs kept per rung, and growth of the budget between rungs
+ETA = 3
+
+# Budget of the first rung, as a share of the full budget
+MIN_BUDGET = 1 / 9
+
+# Full training budget of an MLP (the notebook trains for up to 100 epochs)
+MAX_EPOCHS = 100
+
+DEFAULT_CACHE_DIR = 'data/cv_cache'
+DEFAULT_LEADERBOARD = 'data/leaderboard.csv'
+
+# The notebook's network: 128-64-32-16-8, batch size 32, early stopping after 15 epochs
+NOTEBOOK_MLP = {'hidden': (128, 64, 32, 16, 8), 'batch_size': 32, 'learning_rate': 1e-3, 'patience': 15}
+
+
+def default_configs():
+    """Random forest grid plus MLP variants around the notebook's network"""
+    configs = []
+    for n_estimators, max_depth, min_samples_leaf in itertools.product((100, 300), (None, 6, 10), (1, 3)):
+        configs.append({
+            'name': f"rf-{n_estimators}-{max_depth}-{min_samples_leaf}",
+            'model': 'rf',
+            'n_estimators': n_estimators,
+            'max_depth': max_depth,
+            'min_samples_leaf': min_samples_leaf,
+        })
+    for hidden, batch_size, learning_rate in itertools.product(
+            ((128, 64, 32, 16, 8), (64, 32), (32,)), (32, 128), (1e-3, 3e-3)):
+        configs.append({
+            'name': f"mlp-{'-'.join(map(str, hidden))}-b{batch_size}-lr{learning_rate:g}",
+            'model': 'mlp',
+            **NOTEBOOK_MLP,
+            'hidden': hidden,
+            'batch_size': batch_size,
+            'learning_rate': learning_rate,
+        })
+    return configs
+
+
+def _frame_key(df, n_splits, random_state):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(json.dumps([list(df.columns), n_splits, random_state]).encode())
+    return digest.hexdigest()
+
+
+def cache_folds(df, n_splits=N_SPLITS, cache_dir=DEFAULT_CACHE_DIR, random_state=42):
+    """Preprocessed, scaled arrays of each stratified fold, computed once per dataset
+
+    Returns one dict of .npy paths per fold (X_train, y_train, X_val,
+    y_val). A later call with the same frame reuses the files.
+    """
+    directory = Path(cache_dir) / _frame_key(df, n_splits, random_state)
+    names = ('X_train', 'y_train', 'X_val', 'y_val')
+    folds = [{name: directory / f"fold{i}_{name}.npy" for name in names} for i in range(n_splits)]
+    if all(path.exists() for fold in folds for path in fold.values()):
+        return folds
+
+    directory.mkdir(parents=True, exist_ok=True)
+    y = df[TARGET].to_numpy()
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for fold, (train_rows, val_rows) in zip(folds, splitter.split(df, y)):
+        # Fitted on the fold's training rows only, so validation rows never leak in
+        preprocessor = TitanicPreprocessor(random_state=random_state).fit(df.iloc[train_rows])
+        scaler = StandardScaler().fit(preprocessor.transform(df.iloc[train_rows]))
+        arrays = {
+            'X_train': scaler.transform(preprocessor.transform(df.iloc[train_rows])),
+            'y_train': y[train_rows],
+            'X_val': scaler.transform(preprocessor.transform(df.iloc[val_rows])),
+            'y_val': y[val_rows],
+        }
+        for name, path in fold.items():
+            np.save(path, np.asarray(arrays[name], dtype=np.float32))
+    return folds
+
+
+def _keras_mlp(config, n_features, threads):
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+    except RuntimeError:
+        # Already set by an earlier task in this worker
+        pass
+    model = tf.keras.models.Sequential(
+        [tf.keras.Input(shape=(n_features,))]
+        + [tf.keras.layers.Dense(units, activation='relu') for units in config['hidden']]
+        + [tf.keras.layers.Dense(1, activation='sigmoid')]
+    )
+    model.compile(optimizer=tf.keras.optimizers.Adam(config['learning_rate']),
+                  loss='binary_crossentropy', metrics=['accuracy'])
+    return model, tf.keras.callbacks.EarlyStopping(patience=config['patience'], restore_best_weights=True)
+
+
+def evaluate_fold(config, fold, budget, max_epochs=MAX_EPOCHS, threads=1):
+    """Validation accuracy of one config on one cached fold with a share of its budget
+
+    Random forests get budget of their trees, MLPs budget of max_epochs.
+    'mlp' trains scikit-learn's MLPClassifier; 'keras' trains the
+    notebook's tf.keras network (TensorFlow is imported in the worker).
+    """
+    start = time.perf_counter()
+    X_train, y_train, X_val, y_val = (np.load(fold[name], mmap_mode='r')
+                                      for name in ('X_train', 'y_train', 'X_val', 'y_val'))
+    if config['model'] == 'rf':
+        model = RandomForestClassifier(
+            n_estimators=max(10, round(config['n_estimators'] * budget)),
+            max_depth=config['max_depth'],
+            min_samples_leaf=config['min_samples_leaf'],
+            n_jobs=threads,
+            random_state=42
+        )
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_val)
+    elif config['model'] == 'mlp':
+        model = MLPClassifier(
+            hidden_layer_sizes=config['hidden'],
+            batch_size=config['batch_size'],
+            learning_rate_init=config['learning_rate'],
+            max_iter=max(5, round(max_epochs * budget)),
+            early_stopping=True,
+            n_iter_no_change=config['patience'],
+            random_state=42
+        )
+        with warnings.catch_warnings():
+            # Low-budget rungs stop before convergence on purpose
+            warnings.simplefilter('ignore')
+            model.fit(X_train, y_train)
+        y_pred = model.predict(X_val)
+    elif config['model'] == 'keras':
+        model, early_stopping = _keras_mlp(config, X_train.shape[1], threads)
+        model.fit(np.asarray(X_train), np.asarray(y_train), epochs=max(5, round(max_epochs * budget)),
+                  batch_size=config['batch_size'], validation_split=0.1, callbacks=[early_stopping], verbose=0)
+        y_pred = (model.predict(np.asarray(X_val), batch_size=4096, verbose=0)[:, 0] > 0.5)
+    else:
+        raise ValueError(f"Unknown model '{config['model']}'. Use 'rf', 'mlp' or 'keras'.")
+    return accuracy_score(y_val, y_pred), time.perf_counter() - start
+
+
+def successive_halving(configs, folds, max_workers=DEFAULT_WORKERS, eta=ETA, min_budget=MIN_BUDGET,
+                       max_epochs=MAX_EPOCHS):
+    """Scores configs with k-fold CV, dropping all but the best 1/eta after each rung
+
+    Returns one row per (config, rung): budget, mean and std of the fold
+    accuracies and the summed training seconds.
+    """
+    threads = max(1, (os.cpu_count() or 1) // max_workers)
+    budgets = []
+    budget = 1.0
+    while budget >= min_budget - 1e-9:
+        budgets.insert(0, budget)
+        budget /= eta
+
+    rows = []
+    survivors = list(configs)
+    # Spawned rather than forked: notebook kernels run background threads
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for rung, budget in enumerate(budgets):
+            futures = {
+                (i, f): pool.submit(evaluate_fold, config, fold, budget, max_epochs, threads)
+                for i, config in enumerate(survivors) for f, fold in enumerate(folds)
+            }
+            results = {key: future.result() for key, future in futures.items()}
+            scored = []
+            for i, config in enumerate(survivors):
+                scores, seconds = zip(*(results[i, f] for f in range(len(folds))))
+                row = {'name': config['name'], 'model': config['model'], 'rung': rung, 'budget': budget,
+                       'mean_accuracy': float(np.mean(scores)), 'std_accuracy': float(np.std(scores)),
+                       'seconds': float(np.sum(seconds)),
+                       'params': json.dumps({k: v for k, v in config.items() if k not in ('name', 'model')})}
+                rows.append(row)
+                scored.append((row['mean_accuracy'], i))
+            keep = max(1, len(survivors) // eta)
+            survivors = [survivors[i] for _, i in sorted(scored, key=lambda s: -s[0])[:keep]]
+
+    leaderboard = pd.DataFrame(rows)
+    # Configs that reached the last rungs first, best accuracy first within a rung
+    return leaderboard.sort_values(['rung', 'mean_accuracy'], ascending=[False, False]).reset_index(drop=True)
+
+
+def search(df, configs=None, n_splits=N_SPLITS, cache_dir=DEFAULT_CACHE_DIR, leaderboard_path=DEFAULT_LEADERBOARD,
+           **kwargs):
+    """Runs the cross-validated search on a training frame and writes the leaderboard CSV"""
+    folds = cache_folds(df, n_splits, cache_dir)
+    leaderboard = successive_halving(configs or default_configs(), folds, **kwargs)
+    if leaderboard_path:
+        leaderboard.to_csv(leaderboard_path, index=False)
+    return leaderboard